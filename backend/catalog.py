@@ -0,0 +1,203 @@
+"""
+Precomputed role catalog.
+
+Builds job descriptions, learning roadmaps and embeddings for a list of roles
+and a skill taxonomy ahead of time, loads them into the Redis cache
+namespaces, and writes an on-disk snapshot that a fresh deploy can load at
+startup.
+
+Usage:
+    python -m backend.catalog build --roles roles.txt --skills skills.txt
+    python -m backend.catalog load
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+from backend.config import CATALOG_SNAPSHOT_DIR
+from backend.chains.resume_analyzer import generate_job_description
+from backend.chains.learning_path_agent import generate_learning_path
+from backend.utils.cache_manager import get_cached_jd, get_cached_learning, warm_cache
+from backend.utils.embeddings import embedding_key, encode_cached
+from backend.utils.files import read_list
+from backend.utils.skill_gap import extract_jd_skills
+from backend.utils.logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = "catalog.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+EMBEDDING_KEYS_FILE = "embedding_keys.json"
+
+
+# ==============================
+# RATE LIMITING
+# ==============================
+class RateLimiter:
+    """Spaces calls so at most `per_minute` start in any minute."""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = time.monotonic()
+
+    async def wait(self):
+        now = time.monotonic()
+        delay = self._next - now
+        self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _batches(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+# ==============================
+# BUILD
+# ==============================
+async def build_catalog(
+    roles: list[str],
+    skills: list[str],
+    snapshot_dir: str = CATALOG_SNAPSHOT_DIR,
+    batch_size: int = 4,
+    requests_per_minute: int = 30,
+) -> dict:
+    """
+    Generate (or reuse cached) JDs and roadmaps for every role and skill,
+    compute their embeddings, and write the snapshot to snapshot_dir.
+    Generation goes through the normal cached helpers, so Redis is warmed
+    as a side effect.
+    """
+    limiter = RateLimiter(requests_per_minute)
+
+    async def _jd(role):
+        cached = await get_cached_jd(role)
+        if cached:
+            return role, cached
+        await limiter.wait()
+        return role, await generate_job_description(role)
+
+    async def _roadmap(skill):
+        cached = await get_cached_learning(skill.lower().strip())
+        if cached:
+            return skill, cached
+        await limiter.wait()
+        return skill, (await generate_learning_path([skill])).get(skill)
+
+    jds = {}
+    for batch in _batches(roles, batch_size):
+        jds.update(await asyncio.gather(*(_jd(role) for role in batch)))
+        logger.info("JDs ready: %d/%d", len(jds), len(roles))
+
+    # Taxonomy skills plus every skill the generated JDs ask for.
+    all_skills = list(dict.fromkeys(
+        skills + [s for jd in jds.values() for s in extract_jd_skills(jd)]
+    ))
+
+    roadmaps = {}
+    for batch in _batches(all_skills, batch_size):
+        roadmaps.update(
+            (skill, roadmap)
+            for skill, roadmap in await asyncio.gather(*(_roadmap(s) for s in batch))
+            if roadmap
+        )
+        logger.info("Roadmaps ready: %d/%d", len(roadmaps), len(all_skills))
+
+    texts = list(jds.values()) + all_skills
+    vectors = await encode_cached(texts)
+    keys = [embedding_key(t) for t in texts]
+    logger.info("Embedded %d JDs and skills", len(texts))
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    with open(os.path.join(snapshot_dir, CATALOG_FILE), "w", encoding="utf-8") as f:
+        json.dump({"jd": jds, "learning": roadmaps}, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(snapshot_dir, EMBEDDING_KEYS_FILE), "w", encoding="utf-8") as f:
+        json.dump(keys, f)
+    np.save(os.path.join(snapshot_dir, EMBEDDINGS_FILE), vectors.astype(np.float32))
+
+    logger.info("Snapshot written to %s", snapshot_dir)
+    return {"roles": len(jds), "skills": len(roadmaps), "embeddings": len(keys)}
+
+
+# ==============================
+# LOAD
+# ==============================
+def load_snapshot(snapshot_dir: str = CATALOG_SNAPSHOT_DIR, overwrite: bool = False) -> int:
+    """
+    Load a catalog snapshot into Redis. Keys already present are left alone
+    unless overwrite=True. Returns the number of entries sent (0 if there
+    is no snapshot).
+    """
+    catalog_path = os.path.join(snapshot_dir, CATALOG_FILE)
+    if not os.path.exists(catalog_path):
+        logger.info("No snapshot at %s, skipping warm-up", snapshot_dir)
+        return 0
+
+    with open(catalog_path, encoding="utf-8") as f:
+        catalog = json.load(f)
+
+    embeddings = iter(())
+    vectors_path = os.path.join(snapshot_dir, EMBEDDINGS_FILE)
+    keys_path = os.path.join(snapshot_dir, EMBEDDING_KEYS_FILE)
+    if os.path.exists(vectors_path) and os.path.exists(keys_path):
+        with open(keys_path, encoding="utf-8") as f:
+            keys = json.load(f)
+        # Memory-mapped so large snapshots are streamed row by row.
+        vectors = np.load(vectors_path, mmap_mode="r")
+        embeddings = (
+            (key, [round(float(x), 6) for x in vectors[i]])
+            for i, key in enumerate(keys)
+        )
+
+    sent = warm_cache(
+        catalog.get("jd", {}),
+        catalog.get("learning", {}),
+        embeddings,
+        overwrite=overwrite,
+    )
+    logger.info("Loaded %d snapshot entries into Redis", sent)
+    return sent
+
+
+# ==============================
+# CLI
+# ==============================
+def main(argv=None):
+    configure_logging()
+    parser = argparse.ArgumentParser(prog="python -m backend.catalog")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Generate the catalog and write a snapshot")
+    build.add_argument("--roles", required=True, help="File with one role per line")
+    build.add_argument("--skills", help="Skill taxonomy file, one skill per line")
+    build.add_argument("--snapshot-dir", default=CATALOG_SNAPSHOT_DIR)
+    build.add_argument("--batch-size", type=int, default=4)
+    build.add_argument("--rpm", type=int, default=30, help="Max Gemini calls per minute")
+
+    load = sub.add_parser("load", help="Load a snapshot into Redis")
+    load.add_argument("--snapshot-dir", default=CATALOG_SNAPSHOT_DIR)
+    load.add_argument("--overwrite", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        stats = asyncio.run(build_catalog(
+            read_list(args.roles),
+            read_list(args.skills),
+            snapshot_dir=args.snapshot_dir,
+            batch_size=args.batch_size,
+            requests_per_minute=args.rpm,
+        ))
+        logger.info("Catalog build finished", extra=stats)
+    else:
+        load_snapshot(args.snapshot_dir, overwrite=args.overwrite)
+
+
+if __name__ == "__main__":
+    main()
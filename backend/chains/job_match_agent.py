@@ -1,10 +1,31 @@
+import asyncio
+import base64
+import binascii
+import logging
 import os
 import json
+import time
 import requests
 
-from backend.utils.embeddings import get_embedding_model
-from backend.utils.pinecone_manager import upsert_job, query_jobs
-from backend.utils.redis_client import redis_client
+from backend.config import (
+    JOB_INDEX_MIN_MATCHES,
+    JOB_INDEX_MIN_SCORE,
+    JOBMATCH_MAX_RESULTS,
+)
+from backend.utils.http_cache import content_version
+from backend.utils.job_index import get_postings, index_postings, put_postings, query_index
+from backend.utils.redis_client import async_redis_client, guarded, mget, mset_with_ttl
+from backend.utils.metrics import (
+    CACHE_REQUESTS,
+    JOBMATCH_SOURCE,
+    JSEARCH_JOBS,
+    JSEARCH_LATENCY,
+    JSEARCH_REQUESTS,
+    trace_stage,
+    traced,
+)
+
+logger = logging.getLogger(__name__)
 
 # =====================================
 # CONFIG
@@ -12,29 +33,55 @@ from backend.utils.redis_client import redis_client
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
 RAPIDAPI_HOST = "jsearch.p.rapidapi.com"
 
-embedding_model = get_embedding_model()
-
 # =====================================
 # REDIS CACHE HELPERS
 # =====================================
-def _get_cached_jobs(cache_key: str):
-    try:
-        data = redis_client.get(f"jobs:{cache_key}")
-        return json.loads(data) if data else None
-    except Exception as e:
-        print(f"[redis] Cache read failed: {e}")
-        return None
+# A `jobs:` entry is the ranked candidate list for one search:
+# {"version", "ids", "scores"}. Job details live under `jobdoc:{id}`.
+async def _get_cached_jobs(cache_key: str):
+    data = (await mget([f"jobs:{cache_key}"])).get(f"jobs:{cache_key}")
+    entry = json.loads(data) if data else None
+    if entry is not None and "ids" not in entry:
+        entry = None  # written before ranked entries; rebuild it
+    CACHE_REQUESTS.labels("jobs", "redis", "hit" if entry else "miss").inc()
+    return entry
+
+
+async def _set_cached_jobs(cache_key: str, ranked: list, ttl: int = 60 * 60 * 12) -> dict:
+    """Cache a ranked [(job_id, score), ...] list with its version; returns the entry."""
+    ids = [job_id for job_id, _ in ranked]
+    scores = [score for _, score in ranked]
+    # Unrounded scores: re-embedded (changed) postings give a new version.
+    entry = {"version": content_version([ids, scores]), "ids": ids, "scores": scores}
+    await mset_with_ttl({f"jobs:{cache_key}": (json.dumps(entry), ttl)})
+    return entry
+
+
+# =====================================
+# CURSORS
+# =====================================
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorExpired(InvalidCursor):
+    """The ranked list the cursor pointed into has been rebuilt."""
 
 
-def _set_cached_jobs(cache_key: str, jobs: list, ttl: int = 60 * 60 * 12):
+def _encode_cursor(version: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{version}:{offset}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
     try:
-        redis_client.setex(
-            f"jobs:{cache_key}",
-            ttl,
-            json.dumps(jobs, ensure_ascii=False)
-        )
-    except Exception as e:
-        print(f"[redis] Cache write failed: {e}")
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        version, offset = raw.rsplit(":", 1)
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor("malformed cursor")
+    if offset < 0:
+        raise InvalidCursor("malformed cursor")
+    return version, offset
 
 
 # =====================================
@@ -44,12 +91,13 @@ def fetch_real_jobs(
     role: str,
     location: str = "us",
     pages: int = 1,
-    date_posted: str = "all"
+    date_posted: str = "all",
+    page: int = 1
 ):
     """Fetch live jobs using the JSearch API with filters."""
-    print(
-        f"[job_fetch] Fetching jobs for '{role}' "
-        f"in {location} (date={date_posted}, pages={pages})"
+    logger.info(
+        "Fetching jobs for %s in %s (date=%s, page=%s, pages=%s)",
+        role, location, date_posted, page, pages,
     )
 
     url = "https://jsearch.p.rapidapi.com/search"
@@ -59,34 +107,47 @@ def fetch_real_jobs(
     }
     params = {
         "query": f"{role} jobs",
-        "page": "1",
+        "page": str(page),
         "num_pages": str(pages),
         "country": location,
         "date_posted": date_posted
     }
 
+    start = time.perf_counter()
     try:
         response = requests.get(url, headers=headers, params=params, timeout=20)
+        JSEARCH_LATENCY.observe(time.perf_counter() - start)
+        JSEARCH_REQUESTS.labels(str(response.status_code)).inc()
         if response.status_code != 200:
-            print(
-                f"[job_fetch] API error {response.status_code}: "
-                f"{response.text[:150]}"
+            logger.error(
+                "JSearch API error %s: %s",
+                response.status_code, response.text[:150],
             )
             return []
 
         jobs = response.json().get("data", [])
-        print(f"[job_fetch] ✅ Retrieved {len(jobs)} jobs from API.")
+        JSEARCH_JOBS.inc(len(jobs))
+        logger.info("Retrieved %d jobs from JSearch", len(jobs), extra={"jobs": len(jobs)})
         return jobs
 
     except Exception as e:
-        print(f"[job_fetch] ❌ Request failed: {e}")
+        JSEARCH_REQUESTS.labels("error").inc()
+        logger.error("JSearch request failed: %s", e)
         return []
 
 
 # =====================================
 # MAIN PIPELINE
 # =====================================
-def get_best_job_matches(
+def _enough_matches(ranked: list) -> bool:
+    return (
+        len(ranked) >= JOB_INDEX_MIN_MATCHES
+        and ranked[0][1] >= JOB_INDEX_MIN_SCORE
+    )
+
+
+@traced("get_best_job_matches")
+async def get_best_job_matches(
     role: str,
     country: str = "us",
     remote: bool = False,
@@ -94,110 +155,123 @@ def get_best_job_matches(
     pages: int = 1
 ):
     """
-    Fetch, embed, cache (Redis), and return best-matching jobs using Pinecone.
+    Rank jobs for a search against the Pinecone job index (kept fresh by
+    `python -m backend.job_sync`), falling back to a live JSearch fetch
+    when the index has too few good matches. The ranked candidate list is
+    computed once per search and cached in Redis.
+
+    Returns the cache entry {"version", "ids", "scores"}; version changes
+    whenever the ranking does (used for ETags and cursors).
     """
 
     cache_key = f"{role.lower()}_{country}_{remote}_{date_posted}_{pages}"
 
     # ---------- 1️⃣ CHECK REDIS CACHE ----------
-    cached = _get_cached_jobs(cache_key)
+    cached = await _get_cached_jobs(cache_key)
     if cached:
-        print(f"[redis] Reusing cached jobs for {cache_key}")
+        logger.info("Reusing cached ranking for %s", cache_key)
+        JOBMATCH_SOURCE.labels("cache").inc()
         return cached
 
-    print(
-        f"[job_match_agent] Fetching new jobs for '{role}' "
-        f"in {country} (remote={remote}, date={date_posted})"
-    )
+    # ---------- 2️⃣ QUERY THE JOB INDEX ----------
+    with trace_stage("index_query"):
+        ranked = await query_index(role, country, remote, date_posted, JOBMATCH_MAX_RESULTS)
+    source = "index"
 
-    # ---------- 2️⃣ FETCH JOBS ----------
-    jobs = fetch_real_jobs(
-        role,
-        location=country,
-        pages=pages,
-        date_posted=date_posted
-    )
+    # ---------- 3️⃣ LIVE FETCH FALLBACK ----------
+    if not _enough_matches(ranked):
+        logger.info(
+            "Index has %d matches for %s, fetching live", len(ranked), cache_key
+        )
+        with trace_stage("jsearch_fetch"):
+            jobs = await asyncio.to_thread(
+                fetch_real_jobs,
+                role,
+                location=country,
+                pages=pages,
+                date_posted=date_posted
+            )
+        if jobs:
+            with trace_stage("job_indexing"):
+                await index_postings(jobs, country)
+            ranked = await query_index(role, country, remote, date_posted, JOBMATCH_MAX_RESULTS)
+        source = "live"
 
-    # ---------- 3️⃣ FALLBACK ----------
-    if not jobs:
-        print("[job_match_agent] ❌ No jobs fetched. Returning fallback job.")
-        fallback = [
-            {
+    # ---------- 4️⃣ FALLBACK ----------
+    if not ranked:
+        logger.warning("No jobs found, returning fallback job")
+        JOBMATCH_SOURCE.labels("fallback").inc()
+        fallback_id = f"example:{role.lower()}"
+        await put_postings({
+            fallback_id: {
                 "title": f"{role} (Example Role)",
                 "company": "AI Labs",
                 "description": "Develop and deploy ML models on cloud platforms.",
                 "link": "https://example.com/apply",
-                "score": 0.65
-            }
-        ]
-        _set_cached_jobs(cache_key, fallback)
-        return fallback
-
-    # ---------- 4️⃣ REMOTE FILTER ----------
-    if remote:
-        before = len(jobs)
-        jobs = [
-            j for j in jobs
-            if "remote" in (
-                (j.get("job_title", "") + j.get("job_description", "")).lower()
-            )
-        ]
-        print(
-            f"[job_match_agent] Filtered remote jobs: "
-            f"{len(jobs)} of {before}"
-        )
-
-    # ---------- 5️⃣ UPSERT INTO PINECONE ----------
-    for job in jobs:
-        title = job.get("job_title", "")
-        company = job.get("employer_name", "")
-        desc = job.get("job_description", "")
-        link = job.get("job_apply_link", "")
-
-        text = f"{title} {desc}".strip()
-        if not text:
-            continue
-
-        try:
-            vector = embedding_model.encode([text])[0].tolist()
-            metadata = {
-                "title": title,
-                "company": company,
-                "description": desc,
-                "link": link
             }
-            upsert_job(f"{company}_{title}", text, metadata)
-
-        except Exception as e:
-            print(f"[embedding error] {e}")
-            continue
-
-    # ---------- 6️⃣ QUERY PINECONE ----------
-    pinecone_results = query_jobs(role)
-
-    results = []
-    for match in pinecone_results:
-        results.append({
-            "title": match["metadata"].get("title"),
-            "company": match["metadata"].get("company"),
-            "description": match["metadata"].get("description"),
-            "link": match["metadata"].get("link"),
-            "score": round(match["score"], 2)
         })
+        return await _set_cached_jobs(cache_key, [(fallback_id, 0.65)])
 
-    # ---------- 7️⃣ SAVE TO REDIS ----------
-    _set_cached_jobs(cache_key, results)
-    print(f"[job_match_agent] ✅ Returning {len(results)} best matches (cached).")
+    # ---------- 5️⃣ SAVE TO REDIS ----------
+    JOBMATCH_SOURCE.labels(source).inc()
+    entry = await _set_cached_jobs(cache_key, ranked)
+    logger.info(
+        "Ranked %d matches from %s (cached)", len(ranked), source,
+        extra={"source": source},
+    )
 
-    return results
+    return entry
 
 
-def clear_job_cache():
+async def get_job_matches_page(
+    role: str,
+    country: str = "us",
+    remote: bool = False,
+    date_posted: str = "all",
+    pages: int = 1,
+    cursor: str = None,
+    page_size: int = 5,
+) -> dict:
+    """
+    One page of ranked matches: {"version", "matches", "next_cursor", "total"}.
+    Follow-up pages (cursor set) are sliced from the cached ranking; only
+    that page's job details are looked up.
+    """
+    offset = 0
+    if cursor:
+        version, offset = _decode_cursor(cursor)
+
+    entry = await get_best_job_matches(role, country, remote, date_posted, pages)
+    if cursor and version != entry["version"]:
+        raise CursorExpired("results changed since this cursor was issued")
+
+    page_ids = entry["ids"][offset:offset + page_size]
+    docs = await get_postings(page_ids)
+    matches = [
+        {**docs[job_id], "score": round(score, 2)}
+        for job_id, score in zip(page_ids, entry["scores"][offset:offset + page_size])
+        if job_id in docs
+    ]
+
+    next_offset = offset + page_size
+    return {
+        "version": entry["version"],
+        "matches": matches,
+        "next_cursor": (
+            _encode_cursor(entry["version"], next_offset)
+            if next_offset < len(entry["ids"]) else None
+        ),
+        "total": len(entry["ids"]),
+    }
+
+
+async def clear_job_cache():
     """Clear ALL job-related Redis cache."""
-    try:
-        keys = redis_client.keys("jobs:*")
+    async def _clear():
+        keys = [k async for k in async_redis_client.scan_iter(match="jobs:*", count=500)]
         if keys:
-            redis_client.delete(*keys)
-        print("[redis] Cleared all job search cache.")
-    except Exception as e:
-        print(f"[redis] Cache clear failed: {e}")
+            await async_redis_client.unlink(*keys)
+        return True
+
+    if await guarded("Job cache clear", _clear, default=False):
+        logger.info("Cleared all job search cache")
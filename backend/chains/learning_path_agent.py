@@ -1,73 +1,67 @@
+import asyncio
 import json
+import logging
 import re
 import google.generativeai as genai
 
-from backend.config import GOOGLE_API_KEY
-from backend.utils.cache_manager import get_cached_learning, set_cached_learning
+from backend.config import GOOGLE_API_KEY, ROADMAP_MAX_CONCURRENCY
+from backend.utils.cache_manager import get_cached_learnings, set_cached_learnings
+from backend.utils.metrics import LLM_CALLS, LLM_LATENCY, traced
+
+logger = logging.getLogger(__name__)
 
 # ==============================
 # GEMINI CONFIG
 # ==============================
 genai.configure(api_key=GOOGLE_API_KEY)
 
+# Caps concurrent roadmap calls across all requests, so a resume with many
+# missing skills cannot burst past the Gemini rate limit.
+_roadmap_slots = asyncio.Semaphore(ROADMAP_MAX_CONCURRENCY)
+
 
 # ==============================
 # GEMINI HELPER (ROBUST)
 # ==============================
-def _generate_with_gemini(prompt_text: str) -> str:
+def _generate_with_gemini(prompt_text: str, purpose: str = "roadmap") -> str:
     """Safely generate content from Gemini model."""
+    status = "error"
     try:
-        model = genai.GenerativeModel("models/gemini-2.5-flash")
-        response = model.generate_content(prompt_text)
+        with LLM_LATENCY.labels(purpose).time():
+            model = genai.GenerativeModel("models/gemini-2.5-flash")
+            response = model.generate_content(prompt_text)
 
+        # `.text` raises on blocked responses, so only count the call as ok
+        # once the text is actually out.
         if hasattr(response, "text") and response.text:
-            return response.text
-
-        if hasattr(response, "candidates"):
-            return "".join(
+            text = response.text
+        elif hasattr(response, "candidates"):
+            text = "".join(
                 part.text
                 for c in response.candidates
                 for part in c.content.parts
                 if hasattr(part, "text")
             )
+        else:
+            text = ""
 
-        return ""
+        status = "ok" if text else "empty"
+        return text
 
     except Exception as e:
-        print(f"[gemini] learning path generation error: {e}")
+        logger.error("Gemini learning path generation error: %s", e, extra={"purpose": purpose})
         return ""
 
+    finally:
+        LLM_CALLS.labels(purpose, status).inc()
+
 
 # ==============================
-# MAIN FUNCTION
+# SINGLE-SKILL ROADMAP
 # ==============================
-def generate_learning_path(missing_skills: list[str]) -> dict:
-    """
-    Generates a structured JSON roadmap for each missing skill.
-    Uses Redis cache to avoid repeated Gemini calls.
-    """
-
-    if not missing_skills:
-        return {}
-
-    final_output = {}
-
-    for skill in missing_skills:
-        # ---------- 0️⃣ BASIC SANITY CHECK ----------
-        if not skill or len(skill.strip()) < 2:
-            continue
-
-        skill_key = skill.lower().strip()
-
-        # ---------- 1️⃣ CACHE CHECK ----------
-        cached = get_cached_learning(skill_key)
-        if cached:
-            print(f"[redis] Using cached learning path for: {skill}")
-            final_output[skill] = cached
-            continue
-
-        # ---------- 2️⃣ GEMINI PROMPT (OLD, WORKING VERSION) ----------
-        prompt = f"""
+async def _generate_roadmap(skill: str) -> dict:
+    """Ask Gemini for one skill's roadmap and parse the JSON safely."""
+    prompt = f"""
 You are a helpful AI career mentor.
 
 Generate a structured JSON roadmap for the skill "{skill}" with the following format:
@@ -97,21 +91,67 @@ Rules:
 - Keep names concise and realistic.
 """
 
-        raw_output = _generate_with_gemini(prompt)
+    async with _roadmap_slots:
+        raw_output = await asyncio.to_thread(_generate_with_gemini, prompt, "roadmap")
+
+    try:
+        json_match = re.search(r"\{.*\}", raw_output, re.DOTALL)
+        return json.loads(json_match.group(0)) if json_match else {}
+    except Exception as e:
+        logger.warning("Roadmap parse error for %s: %s", skill, e)
+        return {}
+
+
+# ==============================
+# MAIN FUNCTION
+# ==============================
+@traced("generate_learning_path")
+async def generate_learning_path(missing_skills: list[str]) -> dict:
+    """
+    Generates a structured JSON roadmap for each missing skill.
+    Uses Redis cache (one MGET for all skills) to avoid repeated Gemini calls;
+    cache misses are generated concurrently.
+    """
 
-        # ---------- 3️⃣ PARSE JSON SAFELY ----------
-        try:
-            json_match = re.search(r"\{.*\}", raw_output, re.DOTALL)
-            roadmap = json.loads(json_match.group(0)) if json_match else {}
+    if not missing_skills:
+        return {}
 
-            if roadmap:
-                final_output[skill] = roadmap
-                set_cached_learning(skill_key, roadmap)
-                print(f"[redis] Cached learning path for: {skill}")
-            else:
-                print(f"[learning] No structured roadmap for: {skill}")
+    # ---------- 0️⃣ BASIC SANITY CHECK ----------
+    skills = [s for s in missing_skills if s and len(s.strip()) >= 2]
+    skill_keys = {skill: skill.lower().strip() for skill in skills}
 
-        except Exception as e:
-            print(f"[learning parse error] for {skill}: {e}")
+    # ---------- 1️⃣ CACHE CHECK ----------
+    cached = await get_cached_learnings(list(dict.fromkeys(skill_keys.values())))
 
-    return final_output
+    final_output = {}
+    to_generate = []
+    for skill in skills:
+        roadmap = cached.get(skill_keys[skill])
+        if roadmap:
+            final_output[skill] = roadmap
+        else:
+            to_generate.append(skill)
+    logger.info(
+        "Learning paths: %d cached, %d to generate",
+        len(final_output), len(to_generate),
+        extra={"cached": len(final_output), "to_generate": len(to_generate)},
+    )
+
+    # ---------- 2️⃣ GEMINI GENERATION ----------
+    generated = await asyncio.gather(*(_generate_roadmap(s) for s in to_generate))
+
+    fresh = {}
+    for skill, roadmap in zip(to_generate, generated):
+        if roadmap:
+            final_output[skill] = roadmap
+            fresh[skill_keys[skill]] = roadmap
+        else:
+            logger.warning("No structured roadmap for %s", skill)
+
+    # ---------- 3️⃣ CACHE NEW ROADMAPS ----------
+    if fresh:
+        await set_cached_learnings(fresh)
+        logger.info("Cached learning paths for %s", ", ".join(fresh))
+
+    # Preserve the caller's skill order.
+    return {skill: final_output[skill] for skill in skills if skill in final_output}
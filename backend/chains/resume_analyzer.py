@@ -1,13 +1,19 @@
+import asyncio
 import json
+import logging
 import re
 import google.generativeai as genai
-from sklearn.metrics.pairwise import cosine_similarity
 
-from backend.utils.parsers import extract_text_from_pdf
-from backend.utils.embeddings import get_embedding_model
+from backend.utils.parsers import extract_pages_from_pdf
+from backend.utils.text_compactor import compact_resume_text
+from backend.utils.embeddings import get_embedding_model, encode_cached
+from backend.utils.skill_gap import JD_FILLER_TERMS, compute_skill_gaps, extract_jd_skills
 from backend.chains.learning_path_agent import generate_learning_path
 from backend.utils.cache_manager import get_cached_jd, set_cached_jd
 from backend.config import GOOGLE_API_KEY
+from backend.utils.metrics import LLM_CALLS, LLM_LATENCY, trace_stage, traced
+
+logger = logging.getLogger(__name__)
 
 # ==============================
 # CONFIGURATION
@@ -19,41 +25,50 @@ embedding_model = get_embedding_model()
 # ==============================
 # GEMINI HELPER (ROBUST)
 # ==============================
-def _generate_with_gemini(prompt_text: str) -> str:
+def _generate_with_gemini(prompt_text: str, purpose: str = "generation") -> str:
     """Generate text using Gemini safely and consistently."""
+    status = "error"
     try:
-        model = genai.GenerativeModel("models/gemini-2.5-flash")
-        response = model.generate_content(prompt_text)
+        with LLM_LATENCY.labels(purpose).time():
+            model = genai.GenerativeModel("models/gemini-2.5-flash")
+            response = model.generate_content(prompt_text)
 
+        # `.text` raises on blocked responses, so only count the call as ok
+        # once the text is actually out.
         if hasattr(response, "text") and response.text:
-            return response.text
-
-        if hasattr(response, "candidates"):
-            return "".join(
+            text = response.text
+        elif hasattr(response, "candidates"):
+            text = "".join(
                 part.text
                 for c in response.candidates
                 for part in c.content.parts
                 if hasattr(part, "text")
             )
+        else:
+            text = ""
 
-        return ""
+        status = "ok" if text else "empty"
+        return text
 
     except Exception as e:
-        print(f"[gemini] generation error: {e}")
+        logger.error("Gemini generation error: %s", e, extra={"purpose": purpose})
         return ""
 
+    finally:
+        LLM_CALLS.labels(purpose, status).inc()
+
 
 # ==============================
 # JD GENERATOR (REDIS CACHED)
 # ==============================
-def generate_job_description(target_role: str) -> str:
+async def generate_job_description(target_role: str) -> str:
     """Generate or retrieve cached JD for the given role."""
-    cached_jd = get_cached_jd(target_role)
+    cached_jd = await get_cached_jd(target_role)
     if cached_jd:
-        print(f"[redis] Using cached JD for '{target_role}'")
+        logger.info("Using cached JD for %s", target_role)
         return cached_jd
 
-    print(f"[gemini] Generating new JD for '{target_role}'")
+    logger.info("Generating new JD for %s", target_role)
 
     jd_prompt = (
         f"You are an HR expert generating a concise, skills-only summary for a {target_role}.\n"
@@ -65,46 +80,16 @@ def generate_job_description(target_role: str) -> str:
         f"Now generate for '{target_role}':"
     )
 
-    jd_text = _generate_with_gemini(jd_prompt).strip()
+    jd_text = (await asyncio.to_thread(_generate_with_gemini, jd_prompt, "jd")).strip()
 
     if not jd_text:
         jd_text = f"Seeking a {target_role} skilled in Python, SQL, and modern development tools."
 
-    set_cached_jd(target_role, jd_text)
-    print(f"[redis] JD cached successfully for '{target_role}'")
+    await set_cached_jd(target_role, jd_text)
 
     return jd_text
 
 
-# ==============================
-# GEMINI-BASED MISSING SKILLS
-# ==============================
-def _find_missing_skills_with_gemini(resume_skills, jd_text):
-    """Use Gemini to semantically identify missing skills."""
-    try:
-        skills_str = ", ".join(resume_skills) if resume_skills else "None"
-
-        prompt = (
-            "You are a technical recruiter.\n"
-            "Compare the candidate's skills with the job description below and identify ONLY the missing "
-            "or weakly represented technical skills.\n"
-            "Return ONLY a valid JSON list like: [\"AWS\", \"Docker\", \"Kubernetes\"].\n\n"
-            f"Candidate Skills: {skills_str}\n\n"
-            f"Job Description:\n{jd_text}\n"
-        )
-
-        response = _generate_with_gemini(prompt)
-        json_match = re.search(r"\[.*\]", response, re.DOTALL)
-
-        if json_match:
-            return json.loads(json_match.group(0))
-
-    except Exception as e:
-        print(f"[gemini missing skills] error: {e}")
-
-    return []
-
-
 # ==============================
 # LOCAL FALLBACK MISSING SKILLS
 # ==============================
@@ -112,18 +97,10 @@ def _find_missing_skills_locally(resume_text, jd_text):
     """Fast local fallback using keyword heuristics."""
     jd_tokens = re.findall(r"\b[A-Za-z\+\#\.\/0-9]+\b", jd_text)
 
-    ignore_terms = {
-        "We", "Looking", "Strong", "Ability", "Skills", "Proficiency", "Experience",
-        "Excellent", "Capable", "Develop", "Design", "Drive", "Expertise", "Work",
-        "Collaborate", "Implement", "Build", "Good", "Familiar", "Knowledge",
-        "Understanding", "Engineer", "Role", "Using", "Required", "Preferred",
-        "Job", "Seeking", "Position", "Great", "Must", "Should", "Skill"
-    }
-
     jd_skills = [
         token for token in jd_tokens
         if token[0].isupper()
-        and token not in ignore_terms
+        and token not in JD_FILLER_TERMS
         and len(token) > 2
     ]
 
@@ -138,9 +115,13 @@ def _find_missing_skills_locally(resume_text, jd_text):
 # ==============================
 # MAIN ANALYZER
 # ==============================
-def analyze_resume(file_path: str, target_role: str):
+@traced("analyze_resume")
+async def analyze_resume(file_path: str, target_role: str):
     """Analyze resume, compute similarity, detect gaps, and generate roadmap."""
-    resume_text = extract_text_from_pdf(file_path)
+    with trace_stage("pdf_parse"):
+        pages = await asyncio.to_thread(extract_pages_from_pdf, file_path)
+        # Normalize, de-duplicate headers/footers and fit the prompt token budget.
+        resume_text = compact_resume_text(pages)
 
     if not resume_text or not resume_text.strip():
         return {"error": "Failed to read resume text."}
@@ -157,7 +138,10 @@ def analyze_resume(file_path: str, target_role: str):
         f"Resume:\n{resume_text}"
     )
 
-    raw_output = _generate_with_gemini(extraction_prompt)
+    with trace_stage("resume_extraction"):
+        raw_output = await asyncio.to_thread(
+            _generate_with_gemini, extraction_prompt, "extraction"
+        )
 
     resume_data = {"skills": [], "tools": [], "experience": []}
     try:
@@ -165,38 +149,55 @@ def analyze_resume(file_path: str, target_role: str):
         if json_match:
             resume_data = json.loads(json_match.group(0))
     except Exception as e:
-        print(f"[json parse] error: {e}")
+        logger.warning("Resume extraction JSON parse error: %s", e)
 
     # ---------- 2️⃣ JD GENERATION ----------
-    jd_text = generate_job_description(target_role)
+    with trace_stage("jd_generation"):
+        jd_text = await generate_job_description(target_role)
 
     # ---------- 3️⃣ SIMILARITY SCORE ----------
     all_resume_skills = " ".join(resume_data.get("skills", []))
 
     try:
-        resume_vec = embedding_model.encode([all_resume_skills])
-        jd_vec = embedding_model.encode([jd_text])
-        match_score = float(cosine_similarity(resume_vec, jd_vec)[0][0])
+        with trace_stage("embedding"):
+            # Normalized vectors: the dot product is the cosine similarity.
+            resume_vec = await asyncio.to_thread(
+                embedding_model.encode, [all_resume_skills], normalize_embeddings=True
+            )
+            jd_vec = await encode_cached([jd_text])
+        match_score = float(resume_vec[0] @ jd_vec[0])
     except Exception as e:
-        print(f"[embeddings] error: {e}")
+        logger.error("Embedding error: %s", e)
         match_score = 0.0
 
     # ---------- 4️⃣ MISSING SKILL DETECTION ----------
-    if match_score < 0.8:
-        print(f"[gemini] Using AI-based missing skill detection (match={match_score:.2f})")
-        missing_skills = _find_missing_skills_with_gemini(
-            resume_data.get("skills", []),
-            jd_text
+    jd_skills = extract_jd_skills(jd_text, target_role)
+    candidate_skills = resume_data.get("skills", []) + resume_data.get("tools", [])
+    skill_coverage = {}
+
+    try:
+        with trace_stage("gap_detection"):
+            gaps = await compute_skill_gaps(candidate_skills, jd_skills)
+        missing_skills = gaps["missing"]
+        skill_coverage = gaps["coverage"]
+        logger.info(
+            "%d of %d JD skills missing (match=%.2f)",
+            len(missing_skills), len(jd_skills), match_score,
+            extra={"missing": len(missing_skills), "jd_skills": len(jd_skills)},
         )
-    else:
-        print(f"[local] Using fast local detection (match={match_score:.2f})")
+    except Exception as e:
+        logger.error("Skill gap error: %s", e)
+        jd_skills = []
+
+    if not jd_skills:
+        logger.info("Using fast local skill detection (match=%.2f)", match_score)
         missing_skills = _find_missing_skills_locally(all_resume_skills, jd_text)
 
     # ---------- 5️⃣ LEARNING ROADMAP ----------
     learning_roadmap = {}
     if missing_skills:
-        print(f"[redis/gemini] Generating or reusing roadmap for {len(missing_skills)} skills")
-        learning_roadmap = generate_learning_path(missing_skills)
+        with trace_stage("roadmap_generation"):
+            learning_roadmap = await generate_learning_path(missing_skills)
 
     # ---------- FINAL RESPONSE ----------
     return {
@@ -206,5 +207,6 @@ def analyze_resume(file_path: str, target_role: str):
         "job_description": jd_text,
         "match_score": round(match_score * 100, 2),
         "missing_skills": missing_skills,
+        "skill_coverage": skill_coverage,
         "learning_roadmap": learning_roadmap,
     }
@@ -22,4 +22,102 @@ if not REDIS_URL:
     raise ValueError("🚨 REDIS_URL not found in .env file")
 
 # Optional: Redis behavior tuning
-REDIS_DEFAULT_TTL = int(os.getenv("REDIS_DEFAULT_TTL", 60 * 60 * 24))  # 24 hours
\ No newline at end of file
+REDIS_DEFAULT_TTL = int(os.getenv("REDIS_DEFAULT_TTL", 60 * 60 * 24))  # 24 hours
+
+# Async client pool and circuit breaker
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 1.0))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 0.5))
+REDIS_BREAKER_FAILURES = int(os.getenv("REDIS_BREAKER_FAILURES", 5))
+REDIS_BREAKER_COOLDOWN = float(os.getenv("REDIS_BREAKER_COOLDOWN", 30))
+
+# In-process cache tier in front of Redis (per namespace, per worker)
+LOCAL_CACHE_MAX_ITEMS = int(os.getenv("LOCAL_CACHE_MAX_ITEMS", 2048))
+LOCAL_CACHE_TTL = float(os.getenv("LOCAL_CACHE_TTL", 60))
+
+# ==============================
+# SKILL GAP CONFIG
+# ==============================
+# A JD skill counts as covered when its best resume-skill cosine
+# similarity reaches this threshold.
+SKILL_GAP_THRESHOLD = float(os.getenv("SKILL_GAP_THRESHOLD", 0.6))
+
+# ==============================
+# LEARNING PATH CONFIG
+# ==============================
+# Max Gemini roadmap calls in flight per worker (one call per missing skill).
+ROADMAP_MAX_CONCURRENCY = int(os.getenv("ROADMAP_MAX_CONCURRENCY", 4))
+
+# ==============================
+# RESUME PROMPT BUDGET
+# ==============================
+# Approximate token budget for resume text sent to the extraction prompt.
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", 1500))
+
+# ==============================
+# ROLE CATALOG SNAPSHOT
+# ==============================
+# Directory written by `python -m backend.catalog build` and loaded at startup.
+CATALOG_SNAPSHOT_DIR = os.getenv(
+    "CATALOG_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(__file__), "data", "catalog"),
+)
+
+# ==============================
+# ADMISSION CONTROL
+# ==============================
+# Per-endpoint concurrency and bounded wait queue (per worker).
+ANALYZE_MAX_CONCURRENCY = int(os.getenv("ANALYZE_MAX_CONCURRENCY", 4))
+ANALYZE_MAX_QUEUE = int(os.getenv("ANALYZE_MAX_QUEUE", 16))
+JOBMATCH_MAX_CONCURRENCY = int(os.getenv("JOBMATCH_MAX_CONCURRENCY", 16))
+JOBMATCH_MAX_QUEUE = int(os.getenv("JOBMATCH_MAX_QUEUE", 64))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 10))
+
+# Per-client token bucket (shared across workers via Redis); 0 disables.
+CLIENT_QUOTA_PER_MINUTE = float(os.getenv("CLIENT_QUOTA_PER_MINUTE", 30))
+CLIENT_QUOTA_BURST = int(os.getenv("CLIENT_QUOTA_BURST", 10))
+# Quotas are per client IP unless the caller proves who it is: an X-API-Key
+# listed here gets its own bucket, and a frontend that sends
+# FRONTEND_SECRET as X-Frontend-Secret may name its users with X-Client-Id.
+CLIENT_API_KEYS = {k.strip() for k in os.getenv("CLIENT_API_KEYS", "").split(",") if k.strip()}
+FRONTEND_SECRET = os.getenv("FRONTEND_SECRET", "")
+
+# Largest accepted resume upload.
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", 5)) * 1024 * 1024)
+
+
+# ==============================
+# JOB INDEX SYNC
+# ==============================
+# Roles and countries pulled into Pinecone by `python -m backend.job_sync`.
+JOB_SYNC_ROLES = [r.strip() for r in os.getenv("JOB_SYNC_ROLES", "").split(",") if r.strip()]
+JOB_SYNC_COUNTRIES = [
+    c.strip().lower() for c in os.getenv("JOB_SYNC_COUNTRIES", "us").split(",") if c.strip()
+]
+JOB_SYNC_MAX_PAGES = int(os.getenv("JOB_SYNC_MAX_PAGES", 5))
+JOB_SYNC_INTERVAL = int(os.getenv("JOB_SYNC_INTERVAL", 60 * 60))  # 1 hour
+JOB_EMBED_BATCH_SIZE = int(os.getenv("JOB_EMBED_BATCH_SIZE", 64))
+JOB_UPSERT_BATCH_SIZE = int(os.getenv("JOB_UPSERT_BATCH_SIZE", 100))
+
+# /jobmatch serves straight from the index when it returns at least this many
+# matches with the best one scoring at least JOB_INDEX_MIN_SCORE; otherwise
+# it falls back to a live JSearch fetch.
+JOB_INDEX_MIN_MATCHES = int(os.getenv("JOB_INDEX_MIN_MATCHES", 3))
+JOB_INDEX_MIN_SCORE = float(os.getenv("JOB_INDEX_MIN_SCORE", 0.3))
+
+# Ranked candidates kept per /jobmatch search, and the page size limits
+# for walking them with cursors.
+JOBMATCH_MAX_RESULTS = int(os.getenv("JOBMATCH_MAX_RESULTS", 100))
+JOBMATCH_PAGE_SIZE = int(os.getenv("JOBMATCH_PAGE_SIZE", 5))
+JOBMATCH_MAX_PAGE_SIZE = int(os.getenv("JOBMATCH_MAX_PAGE_SIZE", 50))
+
+# ==============================
+# HTTP RESPONSES
+# ==============================
+# Analysis results are cached per (resume file hash, role) so a re-posted
+# resume is answered (or 304'd) without re-running the pipeline; 0 disables.
+ANALYSIS_CACHE_TTL = int(os.getenv("ANALYSIS_CACHE_TTL", 60 * 60))  # 1 hour
+# Cache-Control max-age on GET /jobmatch, for browsers and reverse proxies.
+JOBMATCH_CACHE_MAX_AGE = int(os.getenv("JOBMATCH_CACHE_MAX_AGE", 300))
+# Responses smaller than this are sent uncompressed.
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 500))
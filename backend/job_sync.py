@@ -0,0 +1,183 @@
+"""
+Incremental job index sync.
+
+Pulls postings for a configured set of roles and countries from the JSearch
+API page by page, embeds only postings that are new or changed, and bulk
+upserts them into the Pinecone job index that /jobmatch queries. A watermark
+(newest posted timestamp seen) is kept in Redis per role/country so later
+runs only ask JSearch for recent postings.
+
+Usage:
+    python -m backend.job_sync run --roles roles.txt --countries us,gb
+    python -m backend.job_sync schedule --interval 3600
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from backend.config import (
+    JOB_SYNC_COUNTRIES,
+    JOB_SYNC_INTERVAL,
+    JOB_SYNC_MAX_PAGES,
+    JOB_SYNC_ROLES,
+)
+from backend.chains.job_match_agent import clear_job_cache, fetch_real_jobs
+from backend.utils.files import read_list
+from backend.utils.job_index import DATE_POSTED_WINDOWS, index_postings
+from backend.utils.logging_config import configure_logging
+from backend.utils.metrics import trace_stage
+from backend.utils.redis_client import async_redis_client, guarded
+
+logger = logging.getLogger(__name__)
+
+# Margin for clock skew and JSearch's coarse `date_posted` buckets.
+WATERMARK_SLACK = 60 * 60
+
+
+# ==============================
+# WATERMARKS
+# ==============================
+def _watermark_key(role: str, country: str) -> str:
+    return f"jobsync:watermark:{role.lower().strip()}:{country.lower()}"
+
+
+async def get_watermark(role: str, country: str) -> int:
+    value = await guarded(
+        "Watermark read", lambda: async_redis_client.get(_watermark_key(role, country))
+    )
+    return int(value) if value else 0
+
+
+async def set_watermark(role: str, country: str, posted_at: int):
+    await guarded(
+        "Watermark write",
+        lambda: async_redis_client.set(_watermark_key(role, country), posted_at),
+    )
+
+
+def date_posted_since(watermark: int) -> str:
+    """Narrowest JSearch `date_posted` bucket that still covers the watermark."""
+    if not watermark:
+        return "all"
+    age = time.time() - watermark + WATERMARK_SLACK
+    for bucket, window in sorted(DATE_POSTED_WINDOWS.items(), key=lambda kv: kv[1]):
+        if age <= window:
+            return bucket
+    return "all"
+
+
+# ==============================
+# SYNC
+# ==============================
+async def stream_pages(role: str, country: str, date_posted: str, max_pages: int):
+    """Yield JSearch result pages one at a time until a page comes back empty."""
+    for page in range(1, max_pages + 1):
+        jobs = await asyncio.to_thread(
+            fetch_real_jobs,
+            role,
+            location=country,
+            pages=1,
+            date_posted=date_posted,
+            page=page,
+        )
+        if not jobs:
+            return
+        yield jobs
+
+
+async def sync_query(role: str, country: str, max_pages: int = JOB_SYNC_MAX_PAGES, full: bool = False) -> dict:
+    """
+    Sync one role/country into the index. Stops paging early once a whole
+    page is no newer than the watermark. full=True ignores the watermark.
+    """
+    watermark = 0 if full else await get_watermark(role, country)
+    date_posted = date_posted_since(watermark)
+    newest = watermark
+    stats = {"pages": 0, "fetched": 0, "indexed": 0}
+
+    with trace_stage("job_sync", role=role, country=country):
+        async for jobs in stream_pages(role, country, date_posted, max_pages):
+            stats["pages"] += 1
+            stats["fetched"] += len(jobs)
+            stats["indexed"] += await index_postings(jobs, country)
+
+            page_newest = max(int(j.get("job_posted_at_timestamp") or 0) for j in jobs)
+            newest = max(newest, page_newest)
+            if watermark and page_newest <= watermark:
+                break
+
+    if newest > watermark:
+        await set_watermark(role, country, newest)
+
+    logger.info(
+        "Synced %s/%s: %d pages, %d fetched, %d indexed (date_posted=%s)",
+        role, country, stats["pages"], stats["fetched"], stats["indexed"], date_posted,
+        extra={"role": role, "country": country, **stats},
+    )
+    return stats
+
+
+async def sync_all(roles: list[str], countries: list[str], max_pages: int = JOB_SYNC_MAX_PAGES, full: bool = False) -> dict:
+    """Sync every role/country pair, one at a time to stay within JSearch quotas."""
+    totals = {"queries": 0, "pages": 0, "fetched": 0, "indexed": 0}
+    for role in roles:
+        for country in countries:
+            try:
+                stats = await sync_query(role, country, max_pages, full)
+            except Exception as e:
+                logger.error("Sync failed for %s/%s: %s", role, country, e)
+                continue
+            totals["queries"] += 1
+            for k, v in stats.items():
+                totals[k] += v
+
+    # Cached /jobmatch results predate the new postings.
+    if totals["indexed"]:
+        await clear_job_cache()
+    return totals
+
+
+async def run_scheduled(roles: list[str], countries: list[str], interval: int, max_pages: int):
+    while True:
+        started = time.monotonic()
+        totals = await sync_all(roles, countries, max_pages)
+        logger.info("Job sync finished", extra=totals)
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+# ==============================
+# CLI
+# ==============================
+def main(argv=None):
+    configure_logging()
+    parser = argparse.ArgumentParser(prog="python -m backend.job_sync")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Sync the job index once")
+    schedule = sub.add_parser("schedule", help="Sync the job index every --interval seconds")
+    schedule.add_argument("--interval", type=int, default=JOB_SYNC_INTERVAL)
+    for p in (run, schedule):
+        p.add_argument("--roles", help="File with one role per line (default: JOB_SYNC_ROLES)")
+        p.add_argument("--countries", help="Comma-separated country codes (default: JOB_SYNC_COUNTRIES)")
+        p.add_argument("--max-pages", type=int, default=JOB_SYNC_MAX_PAGES)
+    run.add_argument("--full", action="store_true", help="Ignore watermarks and re-scan")
+
+    args = parser.parse_args(argv)
+    roles = read_list(args.roles) if args.roles else JOB_SYNC_ROLES
+    countries = (
+        [c.strip().lower() for c in args.countries.split(",") if c.strip()]
+        if args.countries else JOB_SYNC_COUNTRIES
+    )
+    if not roles:
+        parser.error("no roles to sync: pass --roles or set JOB_SYNC_ROLES")
+
+    if args.command == "run":
+        totals = asyncio.run(sync_all(roles, countries, args.max_pages, args.full))
+        logger.info("Job sync finished", extra=totals)
+    else:
+        asyncio.run(run_scheduled(roles, countries, args.interval, args.max_pages))
+
+
+if __name__ == "__main__":
+    main()
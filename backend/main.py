@@ -1,9 +1,53 @@
-from fastapi import FastAPI, UploadFile, Form, Body
+from backend.utils.logging_config import configure_logging
+
+# Configure logging before importing modules that log at import time.
+configure_logging()
+
+from fastapi import FastAPI, UploadFile, Form, Body, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import shutil, os
+import asyncio, hashlib, logging, os, tempfile, time
+from backend.config import (
+    ANALYZE_MAX_CONCURRENCY,
+    ANALYZE_MAX_QUEUE,
+    JOBMATCH_MAX_CONCURRENCY,
+    JOBMATCH_MAX_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT,
+    CLIENT_QUOTA_PER_MINUTE,
+    CLIENT_QUOTA_BURST,
+    CLIENT_API_KEYS,
+    FRONTEND_SECRET,
+    MAX_UPLOAD_BYTES,
+    JOBMATCH_CACHE_MAX_AGE,
+    JOBMATCH_PAGE_SIZE,
+    JOBMATCH_MAX_PAGE_SIZE,
+    COMPRESSION_MIN_BYTES,
+)
 from backend.chains.resume_analyzer import analyze_resume
-from backend.chains.job_match_agent import get_best_job_matches
-from backend.utils.redis_client import redis_client
+from backend.chains.job_match_agent import (
+    CursorExpired,
+    InvalidCursor,
+    get_job_matches_page,
+)
+from backend.utils.redis_client import async_redis_client, redis_breaker
+from backend.utils.cache_manager import (
+    cache_stats,
+    get_cached_analysis,
+    listen_for_invalidations,
+    set_cached_analysis,
+)
+from backend.utils.http_cache import (
+    CompressionMiddleware,
+    json_response,
+    make_etag,
+    parse_fields,
+    select_fields,
+    shape_jobs,
+)
+from backend.utils.metrics import HTTP_LATENCY, render_metrics, trace_stage
+from backend.utils.admission import AdmissionMiddleware, ClientQuota, EndpointLimiter
+from backend.catalog import load_snapshot
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="CareerPath – Resume Analyzer API")
 
@@ -14,43 +58,221 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Root span and latency histogram for every request."""
+    start = time.perf_counter()
+    status = 500
+    with trace_stage("http", method=request.method, path=request.url.path):
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            HTTP_LATENCY.labels(
+                request.method,
+                route.path if route else "unmatched",
+                str(status),
+            ).observe(time.perf_counter() - start)
+
+
+# Admission control runs outermost so overload is shed before any work
+# (including reading the upload) happens.
+app.add_middleware(
+    AdmissionMiddleware,
+    limiters={
+        "/analyze": EndpointLimiter(
+            ANALYZE_MAX_CONCURRENCY, ANALYZE_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT
+        ),
+        "/jobmatch": EndpointLimiter(
+            JOBMATCH_MAX_CONCURRENCY, JOBMATCH_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT
+        ),
+    },
+    quota=ClientQuota(CLIENT_QUOTA_PER_MINUTE, CLIENT_QUOTA_BURST)
+    if CLIENT_QUOTA_PER_MINUTE > 0 else None,
+    upload_limits={"/analyze": MAX_UPLOAD_BYTES},
+    api_keys=CLIENT_API_KEYS,
+    frontend_secret=FRONTEND_SECRET,
+)
+
+
+@app.on_event("startup")
+async def warm_role_catalog():
+    """Load the precomputed role catalog so a fresh Redis starts warm."""
+    try:
+        await asyncio.to_thread(load_snapshot)
+    except Exception as e:
+        logger.error("Snapshot warm-up failed: %s", e)
+
+
+@app.on_event("startup")
+async def start_cache_invalidation_listener():
+    """Keep this worker's local cache tier in sync with writes from other workers."""
+    app.state.invalidation_task = asyncio.create_task(listen_for_invalidations())
+
+
+@app.on_event("shutdown")
+async def stop_cache_invalidation_listener():
+    app.state.invalidation_task.cancel()
+
 
 @app.get("/")
 def root():
     return {"message": "🚀 CareerPath API is running. Visit /docs for testing."}
 
 @app.get("/healthz")
-def health_check():
+async def health_check():
+    if redis_breaker.is_open:
+        return {"status": "degraded", "error": "redis circuit open"}
     try:
-        redis_client.ping()
+        await async_redis_client.ping()
         return {"status": "ok"}
     except Exception as e:
         return {"status": "degraded", "error": str(e)}
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/cache/stats")
+def cache_stats_endpoint():
+    """Per-namespace hit/miss counters for the local and Redis cache tiers."""
+    return cache_stats()
+
 @app.post("/analyze")
-async def analyze_resume_endpoint(file: UploadFile, target_role: str = Form(...)):
-    """Analyze the resume and compute matching insights."""
-    temp_path = f"temp_{file.filename}"
-    with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+async def analyze_resume_endpoint(
+    request: Request,
+    file: UploadFile,
+    target_role: str = Form(...),
+    fields: str = Form(None),
+):
+    """
+    Analyze the resume and compute matching insights. Results are cached
+    per (file hash, role); the ETag only changes when the analysis does.
+    `fields` selects top-level keys.
+    """
+    # Unique temp file: concurrent uploads with the same filename must not collide.
+    digest = hashlib.sha1()
+    with tempfile.NamedTemporaryFile("wb", suffix=".pdf", delete=False) as buffer:
+        for chunk in iter(lambda: file.file.read(1 << 16), b""):
+            digest.update(chunk)
+            buffer.write(chunk)
+        temp_path = buffer.name
+
+    try:
+        entry = await get_cached_analysis(digest.hexdigest(), target_role)
+        if entry is None:
+            result = await analyze_resume(temp_path, target_role)
+            if "error" in result:
+                return result
+            entry = await set_cached_analysis(digest.hexdigest(), target_role, result)
+    finally:
+        os.remove(temp_path)
+
+    fields = parse_fields(fields)
+    return json_response(
+        request,
+        make_etag(entry["version"], fields),
+        lambda: select_fields(entry["result"], fields),
+        cache_control="private, no-cache",
+    )
+
 
-    result = analyze_resume(temp_path, target_role)
-    os.remove(temp_path)
-    return result
+async def _job_match_response(
+    request: Request,
+    role: str,
+    country: str,
+    remote: bool,
+    date_posted: str,
+    num_pages: int,
+    fields,
+    max_description,
+    cursor,
+    page_size,
+    cache_control: str,
+):
+    try:
+        page_size = JOBMATCH_PAGE_SIZE if page_size is None else int(page_size)
+        max_description = None if max_description is None else int(max_description)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="page_size and max_description must be integers")
+    if page_size < 1 or (max_description is not None and max_description < 1):
+        raise HTTPException(status_code=400, detail="page_size and max_description must be at least 1")
+    page_size = min(page_size, JOBMATCH_MAX_PAGE_SIZE)
+    try:
+        fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        page = await get_job_matches_page(
+            role, country=country, remote=remote, date_posted=date_posted,
+            pages=num_pages, cursor=cursor, page_size=page_size,
+        )
+    except CursorExpired as e:
+        raise HTTPException(status_code=410, detail=f"{e}; restart without a cursor")
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return json_response(
+        request,
+        make_etag(page["version"], role, fields, max_description, cursor, page_size),
+        lambda: {
+            "target_role": role,
+            "matches": shape_jobs(page["matches"], fields, max_description),
+            "next_cursor": page["next_cursor"],
+            "total": page["total"],
+        },
+        cache_control=cache_control,
+    )
+
+
+@app.get("/jobmatch")
+async def job_match_get_endpoint(
+    request: Request,
+    target_role: str,
+    country: str = "us",
+    remote: bool = False,
+    date_posted: str = "all",
+    num_pages: int = 1,
+    fields: str = None,
+    max_description: int = None,
+    cursor: str = None,
+    page_size: int = JOBMATCH_PAGE_SIZE,
+):
+    """Cacheable GET form of /jobmatch (filters as query parameters)."""
+    return await _job_match_response(
+        request, target_role, country, remote, date_posted, num_pages,
+        fields, max_description, cursor, page_size,
+        cache_control=f"public, max-age={JOBMATCH_CACHE_MAX_AGE}",
+    )
 
 
 @app.post("/jobmatch")
-async def job_match_endpoint(payload: dict = Body(...)):
-    """Return best-matching jobs for a target role with filters."""
-    role = payload.get("target_role")
-    country = payload.get("country", "us")
-    remote = payload.get("remote", False)
-    date_posted = payload.get("date_posted", "all")
-    num_pages = payload.get("num_pages", 1)
-
-    results = get_best_job_matches(
-        role, country=country, remote=remote, date_posted=date_posted, pages=num_pages
+async def job_match_endpoint(request: Request, payload: dict = Body(...)):
+    """
+    Return one page of best-matching jobs for a target role with filters.
+    Pass the response's `next_cursor` as `cursor` to get the next page.
+    """
+    return await _job_match_response(
+        request,
+        payload.get("target_role"),
+        payload.get("country", "us"),
+        payload.get("remote", False),
+        payload.get("date_posted", "all"),
+        payload.get("num_pages", 1),
+        payload.get("fields"),
+        payload.get("max_description"),
+        payload.get("cursor"),
+        payload.get("page_size"),
+        cache_control="no-cache",
     )
-    return {"target_role": role, "matches": results}
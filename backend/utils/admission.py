@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import math
+import time
+
+from starlette.responses import JSONResponse
+
+from backend.utils.metrics import ADMISSION_INFLIGHT, ADMISSION_REJECTED
+from backend.utils.redis_client import async_redis_client, guarded
+
+logger = logging.getLogger(__name__)
+
+
+class Rejected(Exception):
+    def __init__(self, status: int, reason: str, retry_after: int):
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _UploadTooLarge(Exception):
+    """Raised from receive() once a streamed body passes the upload limit."""
+
+
+# ==============================
+# PER-ENDPOINT CONCURRENCY
+# ==============================
+class EndpointLimiter:
+    """
+    At most `max_concurrency` requests run at once; up to `max_queue` more
+    wait (for at most `queue_timeout` seconds). Anything beyond that is
+    rejected immediately so a burst cannot pile up unbounded work.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.active = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._avg_service_s = 1.0  # EWMA of request duration, for Retry-After
+
+    def retry_after(self) -> int:
+        backlog = (self.waiting + 1) / self.max_concurrency
+        return max(1, math.ceil(self._avg_service_s * backlog))
+
+    async def acquire(self):
+        # Counted synchronously: the semaphore's own state lags behind
+        # callers that have not been scheduled yet.
+        if self.active + self.waiting >= self.max_concurrency + self.max_queue:
+            raise Rejected(503, "queue_full", self.retry_after())
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise Rejected(503, "queue_timeout", self.retry_after())
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def release(self, duration: float):
+        self._avg_service_s = 0.8 * self._avg_service_s + 0.2 * duration
+        self.active -= 1
+        self._semaphore.release()
+
+
+# ==============================
+# PER-CLIENT TOKEN BUCKET (REDIS)
+# ==============================
+# KEYS[1] = bucket key; ARGV = refill rate (tokens/s), capacity, now (ms), cost.
+# Returns {allowed (0/1), milliseconds until `cost` tokens are available}.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+
+tokens = math.min(capacity, tokens + (now - ts) / 1000 * rate)
+local allowed = 0
+local wait_ms = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  wait_ms = math.ceil((cost - tokens) / rate * 1000)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, wait_ms}
+"""
+
+
+class ClientQuota:
+    """Token bucket per client stored in Redis; fails open if Redis is down."""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self._script = async_redis_client.register_script(_TOKEN_BUCKET_LUA)
+
+    async def check(self, client_id: str, cost: int = 1):
+        now_ms = int(time.time() * 1000)
+        result = await guarded(
+            "Quota check",
+            lambda: self._script(
+                keys=[f"quota:{client_id}"],
+                args=[self.rate, self.burst, now_ms, cost],
+            ),
+        )
+        if result is None:
+            return  # Redis unavailable: do not block traffic on the quota store
+        allowed, wait_ms = int(result[0]), int(result[1])
+        if not allowed:
+            raise Rejected(429, "quota_exceeded", max(1, math.ceil(wait_ms / 1000)))
+
+
+# ==============================
+# ASGI MIDDLEWARE
+# ==============================
+def _client_id(scope, api_keys: frozenset = frozenset(), frontend_secret: str = "") -> str:
+    """
+    Quota bucket for a request. Client-supplied ids only count when they can
+    be checked, otherwise a client could escape its bucket by changing them:
+
+    - an X-API-Key listed in `api_keys`,
+    - an X-Client-Id sent together with the shared `frontend_secret`
+      (a trusted frontend naming its own users),
+    - else the peer IP.
+    """
+    headers = dict(scope.get("headers") or [])
+    api_key = headers.get(b"x-api-key", b"").decode("latin-1")
+    if api_key in api_keys:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    client_id = headers.get(b"x-client-id")
+    secret = headers.get(b"x-frontend-secret")
+    if client_id and secret and frontend_secret and hmac.compare_digest(
+        secret, frontend_secret.encode("utf-8")
+    ):
+        return f"client:{client_id.decode('latin-1')}"
+
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+
+class _LimitedBody:
+    """receive() wrapper that stops reading a body once it passes max_bytes."""
+
+    def __init__(self, receive, max_bytes: int):
+        self.receive = receive
+        self.max_bytes = max_bytes
+        self.received = 0
+        self.too_large = False
+
+    async def __call__(self):
+        message = await self.receive()
+        if message["type"] == "http.request":
+            self.received += len(message.get("body", b""))
+            if self.received > self.max_bytes:
+                self.too_large = True
+                raise _UploadTooLarge()
+        return message
+
+
+class AdmissionMiddleware:
+    """
+    Admission control for expensive endpoints, applied before the request
+    body is read:
+
+    1. upload size limit (413 from Content-Length, or while streaming),
+    2. per-client token-bucket quota (429 + Retry-After),
+    3. per-endpoint concurrency with a bounded wait queue (503 + Retry-After).
+    """
+
+    def __init__(
+        self,
+        app,
+        limiters: dict,
+        quota: ClientQuota = None,
+        upload_limits: dict = None,
+        api_keys=(),
+        frontend_secret: str = "",
+    ):
+        self.app = app
+        self.limiters = limiters
+        self.quota = quota
+        self.upload_limits = upload_limits or {}
+        self.api_keys = frozenset(api_keys)
+        self.frontend_secret = frontend_secret
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        limiter = self.limiters.get(path)
+        max_bytes = self.upload_limits.get(path)
+        if scope["type"] != "http" or (limiter is None and not max_bytes):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            self._check_content_length(scope, max_bytes)
+            if self.quota is not None:
+                await self.quota.check(_client_id(scope, self.api_keys, self.frontend_secret))
+            if limiter is not None:
+                await limiter.acquire()
+        except Rejected as r:
+            await self._reject(r, scope, receive, send)
+            return
+
+        body = _LimitedBody(receive, max_bytes) if max_bytes else None
+        started = False
+
+        async def checked_send(message):
+            nonlocal started
+            if body is not None and body.too_large and not started:
+                return  # the app's error for the cut-off body; replaced by a 413 below
+            started = True
+            await send(message)
+
+        if limiter is not None:
+            ADMISSION_INFLIGHT.labels(path).inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, body or receive, checked_send)
+        except _UploadTooLarge:
+            if started:
+                raise
+        finally:
+            if limiter is not None:
+                ADMISSION_INFLIGHT.labels(path).dec()
+                limiter.release(time.perf_counter() - start)
+
+        if body is not None and body.too_large and not started:
+            await self._reject(Rejected(413, "upload_too_large", 0), scope, receive, send)
+
+    @staticmethod
+    def _check_content_length(scope, max_bytes):
+        """Reject oversized uploads up front; bodies without a length are cut off while streaming."""
+        if not max_bytes:
+            return
+        headers = dict(scope.get("headers") or [])
+        length = headers.get(b"content-length")
+        if length is None:
+            return
+        try:
+            length = int(length)
+        except ValueError:
+            raise Rejected(400, "invalid_content_length", 0)
+        if length < 0:
+            raise Rejected(400, "invalid_content_length", 0)
+        if length > max_bytes:
+            raise Rejected(413, "upload_too_large", 0)
+
+    @staticmethod
+    async def _reject(r: Rejected, scope, receive, send):
+        path = scope.get("path", "")
+        ADMISSION_REJECTED.labels(path, r.reason).inc()
+        logger.warning("Rejected %s request: %s", path, r.reason, extra={"reason": r.reason})
+        response = JSONResponse(
+            {"error": r.reason.replace("_", " "), "retry_after": r.retry_after},
+            status_code=r.status,
+            headers={"Retry-After": str(r.retry_after)} if r.retry_after else None,
+        )
+        await response(scope, receive, send)
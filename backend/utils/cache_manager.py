@@ -1,29 +1,244 @@
+import asyncio
 import json
-from backend.utils.redis_client import redis_client
+import logging
+import uuid
+
+import numpy as np
+
+from backend.config import ANALYSIS_CACHE_TTL, LOCAL_CACHE_MAX_ITEMS, LOCAL_CACHE_TTL
+from backend.utils.http_cache import content_version
+from backend.utils.local_cache import LocalCache
+from backend.utils.metrics import CACHE_REQUESTS
+from backend.utils.redis_client import (
+    async_redis_client,
+    guarded,
+    mget,
+    mset_with_ttl,
+    redis_client,
+)
+
+logger = logging.getLogger(__name__)
+
+JD_TTL = 60 * 60 * 24 * 30
+LEARNING_TTL = 60 * 60 * 24 * 60
+EMBEDDING_TTL = 60 * 60 * 24 * 60
 
 # ======================
-# JOB DESCRIPTION CACHE
+# TWO-TIER LOOKUP
 # ======================
-def get_cached_jd(role: str):
-    return redis_client.get(f"jd:{role.lower()}")
+# Tier 1: per-process LRU with a short TTL. Tier 2: Redis.
+# Writes are broadcast on a pub/sub channel so other workers drop stale copies.
+INVALIDATION_CHANNEL = "cache:invalidate"
+WORKER_ID = uuid.uuid4().hex
+
+_local = {
+    namespace: LocalCache(LOCAL_CACHE_MAX_ITEMS, LOCAL_CACHE_TTL)
+    for namespace in ("jd", "learning", "embedding")
+}
+_redis_stats = {namespace: {"hits": 0, "misses": 0} for namespace in _local}
+
+
+async def _tiered_get(namespace: str, ids: list[str], decode) -> dict:
+    """Look ids up locally first, then fetch the rest with one Redis MGET."""
+    local = _local[namespace]
+    found, remote_ids = {}, []
+    for item_id in dict.fromkeys(ids):
+        value = local.get(item_id)
+        if value is None:
+            remote_ids.append(item_id)
+        else:
+            found[item_id] = value
+    CACHE_REQUESTS.labels(namespace, "local", "hit").inc(len(found))
+    CACHE_REQUESTS.labels(namespace, "local", "miss").inc(len(remote_ids))
+
+    if remote_ids:
+        hits = await mget([f"{namespace}:{i}" for i in remote_ids])
+        for item_id in remote_ids:
+            raw = hits.get(f"{namespace}:{item_id}")
+            if raw is not None:
+                value = decode(raw)
+                local.set(item_id, value)
+                found[item_id] = value
+
+        stats = _redis_stats[namespace]
+        stats["hits"] += len(hits)
+        stats["misses"] += len(remote_ids) - len(hits)
+        CACHE_REQUESTS.labels(namespace, "redis", "hit").inc(len(hits))
+        CACHE_REQUESTS.labels(namespace, "redis", "miss").inc(len(remote_ids) - len(hits))
+
+    return found
+
 
-def set_cached_jd(role: str, jd_text: str, ttl=60 * 60 * 24 * 30):
-    redis_client.setex(
-        f"jd:{role.lower()}",
-        ttl,
-        jd_text
+async def _tiered_set(namespace: str, entries: dict, ttl: int):
+    """Write {id: (value, encoded)} to both tiers and notify other workers."""
+    if not entries:
+        return
+    local = _local[namespace]
+    for item_id, (value, _) in entries.items():
+        local.set(item_id, value)
+
+    keys = [f"{namespace}:{i}" for i in entries]
+    await mset_with_ttl({
+        f"{namespace}:{item_id}": (encoded, ttl)
+        for item_id, (_, encoded) in entries.items()
+    })
+    await guarded(
+        "PUBLISH",
+        lambda: async_redis_client.publish(
+            INVALIDATION_CHANNEL, json.dumps({"origin": WORKER_ID, "keys": keys})
+        ),
     )
 
+
+def _apply_invalidation(data: str):
+    message = json.loads(data)
+    if message.get("origin") == WORKER_ID:
+        return
+    if message.get("flush"):
+        clear_local_cache()
+        return
+    for key in message.get("keys", []):
+        namespace, _, item_id = key.partition(":")
+        if namespace in _local:
+            _local[namespace].delete(item_id)
+
+
+async def listen_for_invalidations():
+    """Evict local entries written by other workers. Runs until cancelled."""
+    while True:
+        try:
+            async with async_redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                logger.info("Listening for cache invalidations on %s", INVALIDATION_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message:
+                        _apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Messages may have been missed while disconnected.
+            clear_local_cache()
+            logger.warning("Invalidation listener error: %s; retrying in 5s", e)
+            await asyncio.sleep(5)
+
+
+def clear_local_cache():
+    for local in _local.values():
+        local.clear()
+
+
+def cache_stats() -> dict:
+    """Per-namespace hit/miss counters for the local and Redis tiers."""
+    return {
+        namespace: {
+            "local_hits": local.hits,
+            "local_misses": local.misses,
+            "local_size": len(local),
+            "redis_hits": _redis_stats[namespace]["hits"],
+            "redis_misses": _redis_stats[namespace]["misses"],
+        }
+        for namespace, local in _local.items()
+    }
+
+# ======================
+# JOB DESCRIPTION CACHE
+# ======================
+async def get_cached_jd(role: str):
+    return (await _tiered_get("jd", [role.lower()], str)).get(role.lower())
+
+async def set_cached_jd(role: str, jd_text: str, ttl=JD_TTL):
+    await _tiered_set("jd", {role.lower(): (jd_text, jd_text)}, ttl)
+
 # ======================
 # LEARNING PATH CACHE
 # ======================
-def get_cached_learning(skill: str):
-    data = redis_client.get(f"learning:{skill.lower()}")
+async def get_cached_learning(skill: str):
+    return (await get_cached_learnings([skill])).get(skill)
+
+async def get_cached_learnings(skills: list[str]) -> dict:
+    """Fetch roadmaps for many skills in one lookup; returns {skill: roadmap}."""
+    found = await _tiered_get("learning", [s.lower() for s in skills], json.loads)
+    return {s: found[s.lower()] for s in skills if s.lower() in found}
+
+async def set_cached_learning(skill: str, roadmap: dict, ttl=LEARNING_TTL):
+    await set_cached_learnings({skill: roadmap}, ttl)
+
+async def set_cached_learnings(roadmaps: dict, ttl=LEARNING_TTL):
+    await _tiered_set("learning", {
+        skill.lower(): (roadmap, json.dumps(roadmap))
+        for skill, roadmap in roadmaps.items()
+    }, ttl)
+
+# ======================
+# EMBEDDING CACHE
+# ======================
+def _decode_vector(raw: str):
+    return np.asarray(json.loads(raw), dtype=np.float32)
+
+async def get_cached_embeddings(keys: list[str]) -> dict:
+    """Fetch cached embedding vectors in one lookup; returns {key: vector}."""
+    return await _tiered_get("embedding", keys, _decode_vector)
+
+async def set_cached_embeddings(vectors: dict, ttl=EMBEDDING_TTL):
+    await _tiered_set("embedding", {
+        key: (np.asarray(vector, dtype=np.float32), json.dumps(vector))
+        for key, vector in vectors.items()
+    }, ttl)
+
+# ======================
+# ANALYSIS RESULT CACHE
+# ======================
+# Per-resume results are not shared between users, so they skip the local tier.
+def _analysis_key(file_digest: str, role: str) -> str:
+    return f"analysis:{file_digest}:{role.lower().strip()}"
+
+async def get_cached_analysis(file_digest: str, role: str):
+    """Cached entry {"version", "result"} for this resume and role, or None."""
+    key = _analysis_key(file_digest, role)
+    data = (await mget([key])).get(key)
+    CACHE_REQUESTS.labels("analysis", "redis", "hit" if data else "miss").inc()
     return json.loads(data) if data else None
 
-def set_cached_learning(skill: str, roadmap: dict, ttl=60 * 60 * 24 * 60):
-    redis_client.setex(
-        f"learning:{skill.lower()}",
-        ttl,
-        json.dumps(roadmap)
-    )
+async def set_cached_analysis(file_digest: str, role: str, result: dict, ttl=ANALYSIS_CACHE_TTL) -> dict:
+    entry = {"version": content_version(result), "result": result}
+    if ttl > 0:
+        await mset_with_ttl({
+            _analysis_key(file_digest, role): (json.dumps(entry, ensure_ascii=False), ttl)
+        })
+    return entry
+
+
+# ======================
+# BULK WARM-UP
+# ======================
+def warm_cache(jds: dict, roadmaps: dict, embeddings, overwrite: bool = False) -> int:
+    """
+    Bulk-load precomputed entries into the jd:, learning: and embedding:
+    namespaces in pipelined batches. `embeddings` is an iterable of
+    (key, vector) pairs. Existing keys are kept unless overwrite=True.
+    Returns the number of entries sent to Redis.
+    """
+    def _entries():
+        for role, jd_text in jds.items():
+            yield f"jd:{role.lower()}", jd_text, JD_TTL
+        for skill, roadmap in roadmaps.items():
+            yield f"learning:{skill.lower()}", json.dumps(roadmap), LEARNING_TTL
+        for key, vector in embeddings:
+            yield f"embedding:{key}", json.dumps(vector), EMBEDDING_TTL
+
+    sent = 0
+    pipe = redis_client.pipeline(transaction=False)
+    for key, value, ttl in _entries():
+        pipe.set(key, value, ex=ttl, nx=not overwrite)
+        sent += 1
+        if sent % 500 == 0:
+            pipe.execute()
+    pipe.execute()
+
+    if overwrite:
+        # Overwritten keys may be cached locally by running workers.
+        redis_client.publish(INVALIDATION_CHANNEL, json.dumps({"origin": WORKER_ID, "flush": True}))
+    return sent
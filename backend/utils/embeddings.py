@@ -1,5 +1,11 @@
+import asyncio
+import hashlib
+
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from backend.utils.cache_manager import get_cached_embeddings, set_cached_embeddings
+
 _model = None
 
 def get_embedding_model():
@@ -7,3 +13,37 @@ def get_embedding_model():
     if _model is None:
         _model = SentenceTransformer("all-MiniLM-L6-v2")
     return _model
+
+
+def embedding_key(text: str) -> str:
+    """Stable cache key for a piece of text (case/whitespace-insensitive)."""
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+async def encode_cached(texts: list[str]) -> np.ndarray:
+    """
+    Encode texts into L2-normalized vectors, reusing cached embeddings.
+    Only texts missing from the cache are sent to the model (in one batch).
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    keys = [embedding_key(t) for t in texts]
+    cached = await get_cached_embeddings(keys)
+
+    missing = {k: t for k, t in zip(keys, texts) if k not in cached}
+    if missing:
+        vectors = await asyncio.to_thread(
+            get_embedding_model().encode,
+            list(missing.values()),
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        fresh = dict(zip(missing.keys(), vectors))
+        await set_cached_embeddings({
+            k: [round(float(x), 6) for x in v] for k, v in fresh.items()
+        })
+        cached.update(fresh)
+
+    return np.asarray([cached[k] for k in keys], dtype=np.float32)
@@ -0,0 +1,7 @@
+def read_list(path: str) -> list[str]:
+    """Read one entry per line; blank lines and '#' comments are ignored."""
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        entries = [line.split("#", 1)[0].strip() for line in f]
+    return list(dict.fromkeys(e for e in entries if e))
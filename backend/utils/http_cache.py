@@ -0,0 +1,198 @@
+import gzip
+import hashlib
+
+import orjson
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses are gzip-compressed only
+    brotli = None
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+JOB_FIELDS = ("title", "company", "description", "link", "score")
+
+
+# ==============================
+# VERSIONS & ETAGS
+# ==============================
+def content_version(payload) -> str:
+    """Stable short hash of a cache entry's payload, stored alongside it."""
+    body = orjson.dumps(payload, option=_ORJSON_OPTIONS | orjson.OPT_SORT_KEYS)
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def make_etag(version: str, *variant) -> str:
+    """
+    Weak ETag for a cache entry version plus whatever shapes the response
+    (role, field selection, truncation). Weak because the same entity is
+    served gzip-, brotli- or un-compressed.
+    """
+    if variant:
+        version += "-" + hashlib.sha1(repr(variant).encode("utf-8")).hexdigest()[:8]
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def json_response(request: Request, etag: str, build_payload, cache_control: str) -> Response:
+    """
+    304 when a GET/HEAD client's If-None-Match still matches `etag`;
+    otherwise the JSON payload from build_payload(), serialized with orjson.
+    The payload is only built when it is actually sent. POST responses carry
+    the ETag too, but If-None-Match does not apply to them.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=orjson.dumps(build_payload(), option=_ORJSON_OPTIONS),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+# ==============================
+# RESPONSE SHAPING
+# ==============================
+def parse_fields(fields) -> list[str]:
+    """
+    Accept "title,link" or ["title", "link"]; empty means every field.
+    Raises ValueError for anything else.
+    """
+    if fields is None:
+        return []
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+        raise ValueError("fields must be a comma-separated string or a list of strings")
+    return [f.strip() for f in fields if f.strip()]
+
+
+def shape_jobs(jobs: list, fields: list[str] = None, max_description: int = None) -> list:
+    """Keep only `fields` of each job and cut descriptions to max_description chars."""
+    keep = [f for f in fields if f in JOB_FIELDS] if fields else JOB_FIELDS
+    shaped = []
+    for job in jobs:
+        job = {f: job.get(f) for f in keep}
+        desc = job.get("description")
+        if max_description and desc and len(desc) > max_description:
+            job["description"] = desc[:max_description].rstrip() + "…"
+        shaped.append(job)
+    return shaped
+
+
+def select_fields(payload: dict, fields: list[str] = None) -> dict:
+    if not fields:
+        return payload
+    return {k: v for k, v in payload.items() if k in fields}
+
+
+# ==============================
+# COMPRESSION MIDDLEWARE
+# ==============================
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _accepted_encodings(scope) -> set:
+    headers = dict(scope.get("headers") or [])
+    accepted = set()
+    for part in headers.get(b"accept-encoding", b"").decode("latin-1").split(","):
+        name, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 1.0
+        if q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Brotli (when the `brotli` package is installed) or gzip compression for
+    JSON and text responses of at least `minimum_size` bytes. Response
+    bodies here are small and sent in one piece, so they are buffered and
+    compressed in one go; streamed bodies pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoding_for(self, scope):
+        accepted = _accepted_encodings(scope)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    async def __call__(self, scope, receive, send):
+        encoding = self._encoding_for(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = {k.lower(): v for k, v in start.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            body = message.get("body", b"")
+            if (
+                message.get("more_body")
+                or b"content-encoding" in headers
+                or len(body) < self.minimum_size
+                or not content_type.startswith(_COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self._compress(encoding, body)
+            raw_headers = [
+                (k, v) for k, v in start.get("headers", [])
+                if k.lower() not in (b"content-length", b"vary")
+            ]
+            vary = headers.get(b"vary", b"")
+            if b"accept-encoding" not in vary.lower():
+                vary = vary + b", Accept-Encoding" if vary else b"Accept-Encoding"
+            raw_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", vary),
+            ]
+            await send({**start, "headers": raw_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from backend.config import (
+    JOB_EMBED_BATCH_SIZE,
+    JOB_UPSERT_BATCH_SIZE,
+)
+from backend.utils.embeddings import get_embedding_model
+from backend.utils.metrics import JOB_INDEX_POSTINGS, traced
+from backend.utils.pinecone_manager import fetch_jobs, query_jobs, upsert_jobs
+from backend.utils.redis_client import mget, mset_with_ttl
+
+logger = logging.getLogger(__name__)
+
+embedding_model = get_embedding_model()
+
+# Content hash of every indexed posting, so unchanged postings are skipped,
+# and its display fields (`jobdoc:`), so result pages never hit Pinecone.
+HASH_TTL = 60 * 60 * 24 * 30  # 30 days
+DOC_FIELDS = ("title", "company", "description", "link")
+
+# JSearch `date_posted` values and the window (seconds) each one covers.
+DATE_POSTED_WINDOWS = {
+    "today": 60 * 60 * 24,
+    "3days": 60 * 60 * 24 * 3,
+    "week": 60 * 60 * 24 * 7,
+    "month": 60 * 60 * 24 * 30,
+}
+
+
+# ==============================
+# POSTING → INDEX RECORD
+# ==============================
+def posting_id(job: dict) -> str:
+    company = job.get("employer_name", "")
+    title = job.get("job_title", "")
+    return job.get("job_id") or f"{company}_{title}"
+
+
+def posting_text(job: dict) -> str:
+    return f"{job.get('job_title', '')} {job.get('job_description', '')}".strip()
+
+
+def posting_metadata(job: dict, country: str) -> dict:
+    """Pinecone metadata for a JSearch posting (no None values allowed)."""
+    title = job.get("job_title") or ""
+    desc = job.get("job_description") or ""
+    return {
+        "title": title,
+        "company": job.get("employer_name") or "",
+        "description": desc,
+        "link": job.get("job_apply_link") or "",
+        "country": country.lower(),
+        "remote": bool(job.get("job_is_remote")) or "remote" in f"{title} {desc}".lower(),
+        "posted_at": int(job.get("job_posted_at_timestamp") or 0),
+    }
+
+
+def _content_hash(metadata: dict) -> str:
+    fields = [metadata[f] for f in DOC_FIELDS]
+    return hashlib.sha1("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+
+def _doc(metadata: dict) -> str:
+    return json.dumps({f: metadata.get(f, "") for f in DOC_FIELDS}, ensure_ascii=False)
+
+
+# ==============================
+# INDEXING
+# ==============================
+@traced("job_index.upsert")
+async def index_postings(jobs: list, country: str) -> int:
+    """
+    Embed and upsert the postings that are new or whose content changed
+    since they were last indexed. Returns the number of postings upserted.
+    """
+    records = {}
+    for job in jobs:
+        if posting_text(job):
+            records[posting_id(job)] = (posting_text(job), posting_metadata(job, country))
+    if not records:
+        return 0
+
+    hashes = {job_id: _content_hash(meta) for job_id, (_, meta) in records.items()}
+    known = await mget([f"jobhash:{job_id}" for job_id in hashes])
+    changed = [
+        job_id for job_id, digest in hashes.items()
+        if known.get(f"jobhash:{job_id}") != digest
+    ]
+    JOB_INDEX_POSTINGS.labels("unchanged").inc(len(records) - len(changed))
+    if not changed:
+        return 0
+
+    # One batched encoder call for every changed posting.
+    vectors = await asyncio.to_thread(
+        embedding_model.encode,
+        [records[job_id][0] for job_id in changed],
+        batch_size=JOB_EMBED_BATCH_SIZE,
+        normalize_embeddings=True,
+    )
+    await asyncio.to_thread(
+        upsert_jobs,
+        [
+            {"id": job_id, "values": vector.tolist(), "metadata": records[job_id][1]}
+            for job_id, vector in zip(changed, vectors)
+        ],
+        JOB_UPSERT_BATCH_SIZE,
+    )
+
+    # Only remember hashes once the upsert succeeded.
+    entries = {}
+    for job_id in changed:
+        entries[f"jobhash:{job_id}"] = (hashes[job_id], HASH_TTL)
+        entries[f"jobdoc:{job_id}"] = (_doc(records[job_id][1]), HASH_TTL)
+    await mset_with_ttl(entries)
+    JOB_INDEX_POSTINGS.labels("indexed").inc(len(changed))
+    logger.info(
+        "Indexed %d of %d postings", len(changed), len(records),
+        extra={"indexed": len(changed), "seen": len(records)},
+    )
+    return len(changed)
+
+
+# ==============================
+# QUERYING
+# ==============================
+def index_filter(country: str, remote: bool = False, date_posted: str = "all") -> dict:
+    """Pinecone metadata filter matching the /jobmatch search options."""
+    flt = {"country": country.lower()}
+    if remote:
+        flt["remote"] = True
+    window = DATE_POSTED_WINDOWS.get(date_posted)
+    if window:
+        flt["posted_at"] = {"$gte": int(time.time()) - window}
+    return flt
+
+
+async def query_index(
+    role: str,
+    country: str = "us",
+    remote: bool = False,
+    date_posted: str = "all",
+    top_k: int = 5,
+) -> list:
+    """Ranked [(job_id, score), ...] for a role, best first (no metadata)."""
+    matches = await asyncio.to_thread(
+        query_jobs, role, top_k, index_filter(country, remote, date_posted), False
+    )
+    return [(match["id"], round(float(match["score"]), 6)) for match in matches]
+
+
+async def get_postings(job_ids: list[str]) -> dict:
+    """
+    Display fields for indexed postings, {job_id: doc}. Served from the
+    `jobdoc:` namespace; ids missing there are fetched from Pinecone once
+    and written back.
+    """
+    found = await mget([f"jobdoc:{job_id}" for job_id in job_ids])
+    docs = {
+        job_id: json.loads(found[f"jobdoc:{job_id}"])
+        for job_id in job_ids if f"jobdoc:{job_id}" in found
+    }
+
+    missing = [job_id for job_id in job_ids if job_id not in docs]
+    if missing:
+        fetched = await asyncio.to_thread(fetch_jobs, missing)
+        await mset_with_ttl({
+            f"jobdoc:{job_id}": (_doc(metadata), HASH_TTL)
+            for job_id, metadata in fetched.items()
+        })
+        docs.update({
+            job_id: {f: metadata.get(f, "") for f in DOC_FIELDS}
+            for job_id, metadata in fetched.items()
+        })
+    return docs
+
+
+async def put_postings(docs: dict, ttl: int = HASH_TTL):
+    """Store display fields for postings that are not in the index (e.g. placeholders)."""
+    await mset_with_ttl({
+        f"jobdoc:{job_id}": (_doc(doc), ttl) for job_id, doc in docs.items()
+    })
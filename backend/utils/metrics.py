@@ -0,0 +1,172 @@
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80,
+)
+
+# ==============================
+# METRICS
+# ==============================
+HTTP_LATENCY = Histogram(
+    "careerpath_http_request_seconds",
+    "HTTP request latency.",
+    ["method", "path", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "careerpath_stage_seconds",
+    "Latency of traced pipeline stages.",
+    ["stage", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "careerpath_cache_requests_total",
+    "Cache lookups by namespace, tier and result.",
+    ["namespace", "tier", "result"],
+)
+LLM_CALLS = Counter(
+    "careerpath_llm_calls_total",
+    "Gemini calls by purpose and outcome.",
+    ["purpose", "status"],
+)
+LLM_LATENCY = Histogram(
+    "careerpath_llm_seconds",
+    "Gemini call latency.",
+    ["purpose"],
+    buckets=_LATENCY_BUCKETS,
+)
+VECTOR_STORE_LATENCY = Histogram(
+    "careerpath_vector_store_seconds",
+    "Pinecone operation latency.",
+    ["operation"],
+    buckets=_LATENCY_BUCKETS,
+)
+JSEARCH_REQUESTS = Counter(
+    "careerpath_jsearch_requests_total",
+    "JSearch API requests by HTTP status (or 'error').",
+    ["status"],
+)
+JSEARCH_LATENCY = Histogram(
+    "careerpath_jsearch_seconds",
+    "JSearch API request latency.",
+    buckets=_LATENCY_BUCKETS,
+)
+JSEARCH_JOBS = Counter(
+    "careerpath_jsearch_jobs_total",
+    "Job postings returned by the JSearch API.",
+)
+JOB_INDEX_POSTINGS = Counter(
+    "careerpath_job_index_postings_total",
+    "Job postings seen while indexing, by outcome (indexed/unchanged).",
+    ["outcome"],
+)
+JOBMATCH_SOURCE = Counter(
+    "careerpath_jobmatch_source_total",
+    "Where /jobmatch results came from (cache/index/live/fallback).",
+    ["source"],
+)
+ADMISSION_REJECTED = Counter(
+    "careerpath_admission_rejected_total",
+    "Requests rejected by admission control.",
+    ["path", "reason"],
+)
+ADMISSION_INFLIGHT = Gauge(
+    "careerpath_admission_inflight",
+    "Requests currently admitted and running.",
+    ["path"],
+    multiprocess_mode="livesum",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Serialize all metrics in the Prometheus text format."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Several uvicorn/gunicorn workers: aggregate their metric files.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+# ==============================
+# TRACING
+# ==============================
+# (trace_id, span path) of the span currently running in this task.
+_current_span = contextvars.ContextVar("careerpath_span", default=(None, ""))
+
+
+def current_trace_id():
+    return _current_span.get()[0]
+
+
+@contextmanager
+def trace_stage(stage: str, trace_id: str = None, **fields):
+    """
+    Time a pipeline stage: records STAGE_LATENCY and logs a span line with
+    the trace id, the nested span path and the duration.
+    """
+    parent_trace, parent_path = _current_span.get()
+    trace_id = trace_id or parent_trace or uuid.uuid4().hex[:16]
+    path = f"{parent_path}/{stage}" if parent_path else stage
+    token = _current_span.set((trace_id, path))
+
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        STAGE_LATENCY.labels(stage, status).observe(duration)
+        logger.info(
+            "span %s finished in %.1f ms", path, duration * 1000,
+            extra={
+                "trace_id": trace_id,
+                "span": path,
+                "stage": stage,
+                "status": status,
+                "duration_ms": round(duration * 1000, 2),
+                **fields,
+            },
+        )
+
+
+def traced(stage: str):
+    """Decorator form of trace_stage for sync and async functions."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with trace_stage(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with trace_stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
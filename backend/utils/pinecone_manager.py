@@ -1,3 +1,5 @@
+import logging
+
 from pinecone import Pinecone, ServerlessSpec
 from backend.config import (
     PINECONE_API_KEY,
@@ -5,6 +7,9 @@ from backend.config import (
     PINECONE_INDEX_NAME
 )
 from backend.utils.embeddings import get_embedding_model
+from backend.utils.metrics import VECTOR_STORE_LATENCY, traced
+
+logger = logging.getLogger(__name__)
 
 # Initialize Pinecone
 pc = Pinecone(api_key=PINECONE_API_KEY)
@@ -14,7 +19,7 @@ embedding_model = get_embedding_model()
 def init_pinecone_index():
     existing_indexes = [i["name"] for i in pc.list_indexes()]
     if PINECONE_INDEX_NAME not in existing_indexes:
-        print(f"[pinecone] Creating new index '{PINECONE_INDEX_NAME}'...")
+        logger.info("Creating new Pinecone index %s", PINECONE_INDEX_NAME)
         pc.create_index(
             name=PINECONE_INDEX_NAME,
             dimension=384,  # for all-MiniLM-L6-v2 (SBERT)
@@ -22,7 +27,7 @@ def init_pinecone_index():
             spec=ServerlessSpec(cloud="aws", region="us-east-1")
         )
     else:
-        print(f"[pinecone] Index '{PINECONE_INDEX_NAME}' already exists.")
+        logger.info("Pinecone index %s already exists", PINECONE_INDEX_NAME)
 
     return pc.Index(PINECONE_INDEX_NAME)
 
@@ -33,18 +38,27 @@ index = init_pinecone_index()
 # Utility Functions
 # ---------------------------
 
-def upsert_job(job_id: str, job_text: str, metadata: dict):
-    """Store a job posting in Pinecone with its embedding."""
-    vector = embedding_model.encode([job_text])[0].tolist()
-    index.upsert(vectors=[{
-        "id": job_id,
-        "values": vector,
-        "metadata": metadata
-    }])
-    print(f"[pinecone] Upserted job: {job_id}")
-
-def query_jobs(query_text: str, top_k: int = 5):
-    """Query top K jobs similar to query_text."""
+@traced("pinecone.upsert_batch")
+def upsert_jobs(records: list[dict], batch_size: int = 100):
+    """Bulk upsert pre-embedded records ({"id", "values", "metadata"})."""
+    for i in range(0, len(records), batch_size):
+        with VECTOR_STORE_LATENCY.labels("upsert_batch").time():
+            index.upsert(vectors=records[i:i + batch_size])
+    logger.debug("Upserted %d jobs", len(records))
+
+@traced("pinecone.query")
+def query_jobs(query_text: str, top_k: int = 5, filter: dict = None, include_metadata: bool = True):
+    """Query top K jobs similar to query_text, optionally filtered on metadata."""
     query_vector = embedding_model.encode([query_text])[0].tolist()
-    results = index.query(vector=query_vector, top_k=top_k, include_metadata=True)
+    with VECTOR_STORE_LATENCY.labels("query").time():
+        results = index.query(
+            vector=query_vector, top_k=top_k, include_metadata=include_metadata, filter=filter
+        )
     return results.matches
+
+@traced("pinecone.fetch")
+def fetch_jobs(job_ids: list[str]) -> dict:
+    """Metadata of stored jobs by id, {job_id: metadata}; unknown ids are skipped."""
+    with VECTOR_STORE_LATENCY.labels("fetch").time():
+        results = index.fetch(ids=job_ids)
+    return {job_id: dict(vector.metadata or {}) for job_id, vector in results.vectors.items()}
@@ -1,6 +1,20 @@
+import logging
+import time
+
 import redis
-from backend.config import REDIS_URL
+import redis.asyncio as aioredis
+from backend.config import (
+    REDIS_URL,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_POOL_TIMEOUT,
+    REDIS_BREAKER_FAILURES,
+    REDIS_BREAKER_COOLDOWN,
+)
+
+logger = logging.getLogger(__name__)
 
+# Synchronous client: startup checks, CLI tools and bulk warm-up.
 redis_client = redis.Redis.from_url(
     REDIS_URL,
     decode_responses=True,
@@ -9,9 +23,118 @@ redis_client = redis.Redis.from_url(
     retry_on_timeout=True
 )
 
+# Async client used by every request-path cache helper. A blocking pool makes
+# bursts wait briefly for a free connection instead of failing outright.
+async_redis_client = aioredis.Redis.from_url(
+    REDIS_URL,
+    decode_responses=True,
+    connection_pool_class=aioredis.BlockingConnectionPool,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=REDIS_POOL_TIMEOUT,
+    socket_timeout=REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+    socket_keepalive=True,
+    health_check_interval=30,
+)
+
 # Startup sanity check
 try:
     redis_client.ping()
-    print("[redis] Connected successfully")
+    logger.info("Connected to Redis")
 except Exception as e:
     raise RuntimeError(f"[redis] Connection failed: {e}")
+
+
+# ==============================
+# CIRCUIT BREAKER
+# ==============================
+class CircuitBreaker:
+    """
+    Opens after `max_failures` consecutive errors and rejects calls for
+    `cooldown` seconds; the first call after the cooldown is a trial that
+    closes the breaker again on success.
+    """
+
+    def __init__(self, max_failures: int, cooldown: float):
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            # Half-open: let a trial call through; a failure re-opens it.
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("Redis circuit closed, Redis is healthy again")
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.max_failures:
+            if self.opened_at is None:
+                logger.warning(
+                    "Redis circuit opened after %d failures", self.failures,
+                    extra={"cooldown_s": self.cooldown},
+                )
+            self.opened_at = time.monotonic()
+
+
+redis_breaker = CircuitBreaker(REDIS_BREAKER_FAILURES, REDIS_BREAKER_COOLDOWN)
+
+
+async def guarded(operation: str, coro_fn, default=None):
+    """
+    Run `await coro_fn()` through the circuit breaker. Returns `default`
+    immediately while the breaker is open or when the call fails.
+    """
+    if not redis_breaker.allow():
+        return default
+    try:
+        result = await coro_fn()
+    except Exception as e:
+        redis_breaker.record_failure()
+        logger.warning("Redis %s failed: %s", operation, e, extra={"operation": operation})
+        return default
+    redis_breaker.record_success()
+    return result
+
+
+# ==============================
+# PIPELINED MULTI-KEY HELPERS
+# ==============================
+async def mget(keys: list[str]) -> dict:
+    """Fetch many keys in one round-trip; returns {key: value} for hits only."""
+    if not keys:
+        return {}
+    values = await guarded("MGET", lambda: async_redis_client.mget(keys), default=[])
+    return {k: v for k, v in zip(keys, values) if v is not None}
+
+
+async def mset_with_ttl(entries: dict, nx: bool = False) -> bool:
+    """
+    Write many keys in one pipelined round-trip.
+    `entries` maps key -> (value, ttl_seconds).
+    """
+    if not entries:
+        return True
+
+    async def _write():
+        async with async_redis_client.pipeline(transaction=False) as pipe:
+            for key, (value, ttl) in entries.items():
+                pipe.set(key, value, ex=ttl, nx=nx)
+            await pipe.execute()
+        return True
+
+    return await guarded("MSET", _write, default=False)
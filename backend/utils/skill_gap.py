@@ -0,0 +1,112 @@
+import re
+
+import numpy as np
+
+from backend.config import SKILL_GAP_THRESHOLD
+from backend.utils.embeddings import encode_cached
+
+# Capitalized words that show up in generated JDs but are not skills.
+JD_FILLER_TERMS = {
+    "We", "Looking", "Strong", "Ability", "Skills", "Proficiency", "Experience",
+    "Excellent", "Capable", "Develop", "Design", "Drive", "Expertise", "Work",
+    "Collaborate", "Implement", "Build", "Good", "Familiar", "Knowledge",
+    "Understanding", "Engineer", "Role", "Using", "Required", "Preferred",
+    "Job", "Seeking", "Position", "Great", "Must", "Should", "Skill",
+    "The", "With", "Familiarity", "Expert", "Technical", "Proven", "Solid",
+    "Deep", "Hands-on", "Ideal", "Candidate", "Responsible", "Proficient",
+}
+
+_CHUNK_SPLIT = re.compile(
+    r"[,;:()\n]|\.(?=\s|$)|\b(?:and|or|in|with|like|such as|including|e\.g)\b",
+    re.IGNORECASE,
+)
+_MAX_SKILL_WORDS = 4
+
+
+def _is_skill_token(token: str) -> bool:
+    return bool(token) and (token[0].isupper() or token[0].isdigit())
+
+
+# ==============================
+# JD SKILL EXTRACTION
+# ==============================
+def extract_jd_skills(jd_text: str, target_role: str = "") -> list[str]:
+    """
+    Pull skill phrases out of a short generated JD.
+
+    The JD is split into list-like chunks; from each chunk we keep the first
+    run of capitalized tokens (e.g. "Looking for expertise in Machine Learning"
+    -> "Machine Learning", "cloud tools like AWS" -> "AWS"). Filler words are
+    trimmed from both ends, and the target role itself is never a skill.
+    """
+    role = target_role.strip().lower()
+    skills = []
+    for chunk in _CHUNK_SPLIT.split(jd_text or ""):
+        tokens = re.findall(r"[A-Za-z0-9\+\#\./\-]+", chunk)
+
+        start = next(
+            (
+                i for i, tok in enumerate(tokens)
+                if _is_skill_token(tok) and tok not in JD_FILLER_TERMS
+            ),
+            None,
+        )
+        if start is None:
+            continue
+
+        phrase = []
+        for tok in tokens[start:]:
+            if not _is_skill_token(tok) or len(phrase) == _MAX_SKILL_WORDS:
+                break
+            phrase.append(tok)
+        while phrase and phrase[-1] in JD_FILLER_TERMS:
+            phrase.pop()
+
+        skill = " ".join(phrase).strip(".-/")
+        if len(skill) > 1 and skill.lower() != role:
+            skills.append(skill)
+
+    return list(dict.fromkeys(skills))  # remove duplicates, keep order
+
+
+# ==============================
+# VECTORIZED GAP ENGINE
+# ==============================
+async def compute_skill_gaps(
+    resume_skills: list[str],
+    jd_skills: list[str],
+    threshold: float = SKILL_GAP_THRESHOLD,
+) -> dict:
+    """
+    Compare every JD skill against every resume skill in one similarity matrix.
+
+    Returns:
+        {
+          "missing": [JD skills whose best match is below threshold],
+          "coverage": {jd_skill: best cosine similarity (0–1)},
+        }
+    """
+    if not jd_skills:
+        return {"missing": [], "coverage": {}}
+
+    resume_skills = [s for s in resume_skills if s and s.strip()]
+    if not resume_skills:
+        return {
+            "missing": list(jd_skills),
+            "coverage": {skill: 0.0 for skill in jd_skills},
+        }
+
+    # Vectors are L2-normalized, so the dot product is the cosine similarity.
+    jd_vecs = await encode_cached(jd_skills)
+    resume_vecs = await encode_cached(resume_skills)
+    similarity = jd_vecs @ resume_vecs.T
+    best = np.clip(similarity.max(axis=1), 0.0, 1.0)
+
+    coverage = {
+        skill: round(float(score), 3) for skill, score in zip(jd_skills, best)
+    }
+    missing = [
+        skill for skill, score in zip(jd_skills, best) if score < threshold
+    ]
+
+    return {"missing": missing, "coverage": coverage}
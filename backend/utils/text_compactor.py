@@ -0,0 +1,218 @@
+import logging
+import math
+import re
+from collections import Counter
+
+from backend.config import RESUME_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+# ==============================
+# SECTION DEFINITIONS
+# ==============================
+# Heading text (lower-cased, without trailing ':') -> canonical section.
+SECTION_ALIASES = {
+    "skills": "skills",
+    "technical skills": "skills",
+    "key skills": "skills",
+    "core skills": "skills",
+    "core competencies": "skills",
+    "skills & tools": "skills",
+    "skills and tools": "skills",
+    "tech stack": "skills",
+    "tools & technologies": "skills",
+    "technologies": "skills",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment history": "experience",
+    "internships": "experience",
+    "internship experience": "experience",
+    "projects": "projects",
+    "academic projects": "projects",
+    "personal projects": "projects",
+    "key projects": "projects",
+    "summary": "summary",
+    "professional summary": "summary",
+    "profile": "summary",
+    "about me": "summary",
+    "objective": "summary",
+    "career objective": "summary",
+    "certifications": "certifications",
+    "certificates": "certifications",
+    "licenses & certifications": "certifications",
+    "courses": "certifications",
+    "education": "education",
+    "academic background": "education",
+    "achievements": "achievements",
+    "awards": "achievements",
+    "honors & awards": "achievements",
+    "publications": "achievements",
+    "interests": "interests",
+    "hobbies": "interests",
+    "references": "interests",
+    "declaration": "interests",
+    "personal details": "interests",
+}
+
+# Lower value = kept first when the resume exceeds the token budget.
+SECTION_PRIORITY = {
+    "skills": 0,
+    "experience": 1,
+    "projects": 2,
+    "summary": 3,
+    "certifications": 4,
+    "header": 5,
+    "education": 5,
+    "achievements": 6,
+    "other": 7,
+    "interests": 9,
+}
+
+_PAGE_NUMBER = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+_INVISIBLE = re.compile(r"[\u200b\u200c\u200d\ufeff\x00-\x08\x0b\x0e-\x1f]")
+_EDGE_LINES = 3  # lines at the top/bottom of a page checked for headers/footers
+
+
+# ==============================
+# HELPERS
+# ==============================
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token estimate (~4 characters per token)."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def normalize_whitespace(text: str) -> list[str]:
+    """Return the non-empty, whitespace-collapsed lines of text."""
+    text = _INVISIBLE.sub("", text.replace("\xa0", " ").replace("\f", "\n"))
+    lines = (re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
+def _edge_signature(line: str) -> str:
+    # Digits vary between pages ("Page 1", "Page 2"), so ignore them.
+    return re.sub(r"\d+", "#", line.lower())
+
+
+def strip_repeated_headers(pages: list[list[str]]) -> list[list[str]]:
+    """Drop page numbers and de-duplicate header/footer lines repeated across pages."""
+    repeated = set()
+    if len(pages) > 1:
+        counts = Counter(
+            sig
+            for lines in pages
+            for sig in {
+                _edge_signature(l)
+                for l in lines[:_EDGE_LINES] + lines[-_EDGE_LINES:]
+            }
+        )
+        min_pages = max(2, math.ceil(len(pages) / 2))
+        repeated = {sig for sig, n in counts.items() if n >= min_pages}
+
+    cleaned = []
+    seen = set()  # keep the first copy of each repeated header/footer
+    for lines in pages:
+        edge = set(range(_EDGE_LINES)) | set(range(len(lines) - _EDGE_LINES, len(lines)))
+        kept = []
+        for i, line in enumerate(lines):
+            if i not in edge:
+                kept.append(line)
+                continue
+            # Bare numbers mid-page are content ("2019", "3" years), not page numbers.
+            if _PAGE_NUMBER.match(line):
+                continue
+            sig = _edge_signature(line)
+            if sig in repeated:
+                if sig in seen:
+                    continue
+                seen.add(sig)
+            kept.append(line)
+        cleaned.append(kept)
+    return cleaned
+
+
+def _section_name(line: str):
+    if len(line) > 40:
+        return None
+    heading = line.strip(" :•-–|*").lower()
+    return SECTION_ALIASES.get(heading)
+
+
+def split_sections(lines: list[str]) -> list[tuple[str, list[str]]]:
+    """Group lines into (section, lines) blocks in document order."""
+    sections = [("header", [])]
+    for line in lines:
+        name = _section_name(line)
+        if name:
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def _trim_to_budget(sections, budget: int):
+    """
+    Keep whole sections by priority. A section that overflows is cut at a
+    line boundary, and smaller lower-priority sections may still fill the
+    rest of the budget.
+    """
+    order = sorted(
+        range(len(sections)),
+        key=lambda i: (SECTION_PRIORITY.get(sections[i][0], SECTION_PRIORITY["other"]), i),
+    )
+    kept = {}
+    remaining = budget
+    for i in order:
+        _, lines = sections[i]
+        cost = estimate_tokens("\n".join(lines))
+        if cost <= remaining:
+            kept[i] = lines
+            remaining -= cost
+            continue
+
+        partial, partial_cost = [], 0
+        for line in lines:
+            line_cost = estimate_tokens(line) + 1
+            if partial_cost + line_cost > remaining:
+                break
+            partial.append(line)
+            partial_cost += line_cost
+        if len(partial) > 1:  # more than just the heading
+            kept[i] = partial
+            remaining -= partial_cost
+
+    # Re-emit in original order so the prompt still reads like a resume.
+    return [(sections[i][0], kept[i]) for i in sorted(kept)]
+
+
+# ==============================
+# MAIN ENTRY POINT
+# ==============================
+def compact_resume_text(pages: list[str], token_budget: int = RESUME_TOKEN_BUDGET) -> str:
+    """
+    Clean raw PDF page texts and fit them into token_budget.
+
+    Steps: normalize whitespace -> drop repeated headers/footers and page
+    numbers -> detect sections -> trim by section priority.
+    """
+    raw_text = "\n".join(pages)
+    before = estimate_tokens(raw_text)
+
+    page_lines = strip_repeated_headers([normalize_whitespace(p) for p in pages])
+    sections = split_sections([line for lines in page_lines for line in lines])
+
+    if estimate_tokens("\n".join(l for _, lines in sections for l in lines)) > token_budget:
+        sections = _trim_to_budget(sections, token_budget)
+
+    compacted = "\n".join(line for _, lines in sections for line in lines)
+    after = estimate_tokens(compacted)
+    logger.info(
+        "Resume compacted from %d to %d tokens", before, after,
+        extra={
+            "tokens_before": before,
+            "tokens_after": after,
+            "token_budget": token_budget,
+            "sections": [name for name, _ in sections],
+        },
+    )
+    return compacted
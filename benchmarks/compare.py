@@ -0,0 +1,73 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare base.json head.json [--threshold 0.10]
+
+Exits with status 1 when any scenario's p95 latency grows, or its throughput
+drops, by more than the threshold (a fraction of the base value).
+"""
+import argparse
+import json
+import sys
+
+
+def _delta(base: float, head: float) -> float:
+    return (head - base) / base if base else 0.0
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"{'scenario':<18} {'metric':<16} {'base':>10} {'head':>10} {'change':>8}")
+
+    for name, head_stats in head["scenarios"].items():
+        base_stats = base["scenarios"].get(name)
+        if not base_stats:
+            continue
+
+        if name == "encoder":
+            for batch, stats in head_stats.items():
+                old = base_stats.get(batch, {}).get("texts_per_s")
+                new = stats["texts_per_s"]
+                if old:
+                    change = _delta(old, new)
+                    print(f"{name:<18} {batch + ' t/s':<16} {old:>10.1f} {new:>10.1f} {change:>+8.1%}")
+                    if change < -threshold:
+                        regressions.append(f"{name} {batch} throughput {change:+.1%}")
+            continue
+
+        for metric, higher_is_better in (("throughput_rps", True), ("p50_ms", False), ("p95_ms", False)):
+            old, new = base_stats.get(metric), head_stats.get(metric)
+            if old is None or new is None:
+                continue
+            change = _delta(old, new)
+            print(f"{name:<18} {metric:<16} {old:>10.1f} {new:>10.1f} {change:>+8.1%}")
+            worse = -change if higher_is_better else change
+            if metric != "p50_ms" and worse > threshold:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.head, encoding="utf-8") as f:
+        head = json.load(f)
+
+    print(f"base={base['meta']['commit']}  head={head['meta']['commit']}\n")
+    regressions = compare(base, head, args.threshold)
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\nNo regressions beyond threshold.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Deterministic, offline stand-ins for every external service the backend
+touches: Gemini, the JSearch API, Pinecone, the sentence-transformers
+encoder, PDF loading and Redis.
+
+`install_fakes()` must run before anything under `backend` is imported,
+because those modules connect to their services at import time.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+import types
+from dataclasses import dataclass
+
+import numpy as np
+
+EMBEDDING_DIM = 384
+FRONTEND_SECRET = "fake-frontend-secret"
+
+_SKILL_POOL = [
+    "Python", "SQL", "Machine Learning", "Deep Learning", "TensorFlow",
+    "PyTorch", "Docker", "Kubernetes", "AWS", "GCP", "Azure", "Spark",
+    "Airflow", "Pandas", "NumPy", "React", "TypeScript", "Node.js", "Java",
+    "Spring Boot", "Go", "Terraform", "CI/CD", "Git", "Linux", "Redis",
+    "PostgreSQL", "MongoDB", "Kafka", "REST APIs", "GraphQL", "MLOps",
+]
+
+FIXTURE_RESUME_PAGES = [
+    "Jane Doe | jane.doe@example.com | +1 555 0100\n"
+    "SUMMARY\nData professional with 5 years of experience building ML systems.\n"
+    "SKILLS\nPython, SQL, Pandas, NumPy, Machine Learning, Git, Docker\n"
+    "EXPERIENCE\nAcme Analytics — Data Scientist (2021–present)\n"
+    + "• Built and deployed forecasting models serving 2M daily predictions.\n" * 12
+    + "Page 1 of 2",
+    "Jane Doe | jane.doe@example.com | +1 555 0100\n"
+    "PROJECTS\nChurn prediction pipeline with Airflow and PostgreSQL.\n"
+    "EDUCATION\nB.Sc. Computer Science, State University\n"
+    "INTERESTS\nChess, hiking\nPage 2 of 2",
+]
+
+
+@dataclass
+class FakeLatency:
+    """Simulated service latencies in seconds."""
+    gemini: float = 0.3
+    jsearch: float = 0.5
+    vector_store: float = 0.02
+    encoder_per_batch: float = 0.005
+    encoder_per_text: float = 0.001
+
+
+LATENCY = FakeLatency()
+CALL_COUNTS = {"gemini": 0, "jsearch": 0, "vector_query": 0, "vector_upsert": 0, "encode": 0}
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _pick(seed: str, n: int) -> list[str]:
+    rng = np.random.default_rng(_digest(seed))
+    return [_SKILL_POOL[i] for i in rng.choice(len(_SKILL_POOL), size=n, replace=False)]
+
+
+# ==============================
+# GEMINI
+# ==============================
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+        self.candidates = []
+
+
+class FakeGenerativeModel:
+    def __init__(self, model_name: str, *args, **kwargs):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, *args, **kwargs):
+        CALL_COUNTS["gemini"] += 1
+        time.sleep(LATENCY.gemini)
+
+        if "structured resume parser" in prompt:
+            return _FakeResponse(json.dumps({
+                "skills": _pick(prompt, 8),
+                "tools": _pick("tools" + prompt, 4),
+                "experience": ["Built ML models", "Deployed APIs"],
+            }))
+        if "HR expert" in prompt:
+            skills = _pick(prompt, 7)
+            return _FakeResponse(
+                f"Looking for expertise in {', '.join(skills[:-1])}, and {skills[-1]}."
+            )
+        if "career mentor" in prompt:
+            return _FakeResponse(json.dumps({
+                "course": {"name": "Intro course", "link": "https://example.com/course"},
+                "video": {"title": "Tutorial", "link": "https://youtube.com/watch?v=x"},
+                "project": {"idea": "Build a demo", "link": "https://github.com/x/y"},
+                "certification": {"name": "Cert", "link": "https://example.com/cert"},
+            }))
+        return _FakeResponse("")
+
+
+def _fake_genai_module():
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = lambda **kwargs: None
+    genai.GenerativeModel = FakeGenerativeModel
+    google = sys.modules.get("google") or types.ModuleType("google")
+    google.generativeai = genai
+    return google, genai
+
+
+# ==============================
+# SENTENCE TRANSFORMERS
+# ==============================
+def fake_embed(text: str) -> np.ndarray:
+    """Hashed bag-of-words vector: identical words give similar vectors."""
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for word in text.lower().split():
+        rng = np.random.default_rng(_digest(word))
+        vec += rng.standard_normal(EMBEDDING_DIM).astype(np.float32)
+    if not vec.any():
+        vec[0] = 1.0
+    return vec
+
+
+class FakeSentenceTransformer:
+    def __init__(self, model_name: str, *args, **kwargs):
+        self.model_name = model_name
+
+    def encode(self, texts, normalize_embeddings=False, convert_to_numpy=True, **kwargs):
+        CALL_COUNTS["encode"] += 1
+        if isinstance(texts, str):
+            texts = [texts]
+        time.sleep(LATENCY.encoder_per_batch + LATENCY.encoder_per_text * len(texts))
+        vectors = np.stack([fake_embed(t) for t in texts]) if texts else np.zeros((0, EMBEDDING_DIM))
+        if normalize_embeddings:
+            vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+# ==============================
+# PINECONE
+# ==============================
+def _matches_filter(metadata: dict, flt: dict) -> bool:
+    for field, cond in (flt or {}).items():
+        value = metadata.get(field)
+        if not isinstance(cond, dict):
+            cond = {"$eq": cond}
+        for op, target in cond.items():
+            if op == "$eq" and value != target:
+                return False
+            if op == "$ne" and value == target:
+                return False
+            if op == "$in" and value not in target:
+                return False
+            if op == "$gte" and (value is None or value < target):
+                return False
+            if op == "$lte" and (value is None or value > target):
+                return False
+    return True
+
+
+class _Result:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class FakeIndex:
+    def __init__(self):
+        self.vectors = {}  # id -> (np.ndarray, metadata)
+
+    def upsert(self, vectors, **kwargs):
+        CALL_COUNTS["vector_upsert"] += 1
+        time.sleep(LATENCY.vector_store)
+        for v in vectors:
+            vec = np.asarray(v["values"], dtype=np.float32)
+            self.vectors[v["id"]] = (vec / (np.linalg.norm(vec) or 1.0), v.get("metadata", {}))
+        return {"upserted_count": len(vectors)}
+
+    def query(self, vector, top_k=5, include_metadata=False, filter=None, **kwargs):
+        CALL_COUNTS["vector_query"] += 1
+        time.sleep(LATENCY.vector_store)
+        ids = [i for i, (_, meta) in self.vectors.items() if _matches_filter(meta, filter)]
+        if not ids:
+            return _Result(matches=[])
+
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = np.stack([self.vectors[i][0] for i in ids]) @ query
+        order = np.argsort(-scores)[:top_k]
+        return _Result(matches=[
+            {
+                "id": ids[j],
+                "score": float(scores[j]),
+                "metadata": self.vectors[ids[j]][1] if include_metadata else {},
+            }
+            for j in order
+        ])
+
+    def fetch(self, ids, **kwargs):
+        time.sleep(LATENCY.vector_store)
+        return _Result(vectors={
+            i: _Result(id=i, values=self.vectors[i][0].tolist(), metadata=self.vectors[i][1])
+            for i in ids if i in self.vectors
+        })
+
+
+class FakePinecone:
+    _indexes = {}
+
+    def __init__(self, api_key=None, **kwargs):
+        pass
+
+    def list_indexes(self):
+        return [{"name": name} for name in self._indexes]
+
+    def create_index(self, name, **kwargs):
+        self._indexes.setdefault(name, FakeIndex())
+
+    def Index(self, name):
+        return self._indexes.setdefault(name, FakeIndex())
+
+
+def _fake_pinecone_module():
+    module = types.ModuleType("pinecone")
+    module.Pinecone = FakePinecone
+    module.ServerlessSpec = lambda **kwargs: kwargs
+    return module
+
+
+# ==============================
+# PDF LOADING
+# ==============================
+class FakePyPDFLoader:
+    """Ignores the uploaded bytes and returns the fixture resume pages."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def load(self):
+        return [_Result(page_content=page, metadata={}) for page in FIXTURE_RESUME_PAGES]
+
+
+def _fake_langchain_modules():
+    loaders = types.ModuleType("langchain_community.document_loaders")
+    loaders.PyPDFLoader = FakePyPDFLoader
+    package = types.ModuleType("langchain_community")
+    package.document_loaders = loaders
+    return package, loaders
+
+
+# ==============================
+# JSEARCH
+# ==============================
+class _FakeHTTPResponse:
+    def __init__(self, payload: dict, status_code: int = 200):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return self._payload
+
+
+def fake_jsearch_jobs(query: str, country: str, page: int, per_page: int = 10) -> list[dict]:
+    role = query.removesuffix(" jobs")
+    now = int(time.time())
+    jobs = []
+    for i in range(per_page):
+        n = (page - 1) * per_page + i
+        skills = _pick(f"{role}-{country}-{n}", 5)
+        jobs.append({
+            "job_id": f"{_digest(role + country) :x}-{n}",
+            "job_title": f"{role} {['', 'Senior ', 'Lead ', 'Junior '][n % 4]}#{n}".strip(),
+            "employer_name": f"Company {n % 17}",
+            "job_description": (
+                f"We are hiring a {role}. Required: {', '.join(skills)}. "
+                + "You will design, build and operate production systems. " * 3
+                + ("This is a remote position." if n % 3 == 0 else "")
+            ),
+            "job_apply_link": f"https://jobs.example.com/{n}",
+            "job_country": country.upper(),
+            "job_is_remote": n % 3 == 0,
+            "job_posted_at_timestamp": now - n * 3600,
+        })
+    return jobs
+
+
+def make_fake_requests_get(real_get):
+    def fake_get(url, params=None, **kwargs):
+        if "jsearch" not in url:
+            return real_get(url, params=params, **kwargs)
+        CALL_COUNTS["jsearch"] += 1
+        params = params or {}
+        num_pages = int(params.get("num_pages", 1))
+        page = int(params.get("page", 1))
+        time.sleep(LATENCY.jsearch * num_pages)
+        data = []
+        for p in range(page, page + num_pages):
+            data += fake_jsearch_jobs(params.get("query", ""), params.get("country", "us"), p)
+        return _FakeHTTPResponse({"status": "OK", "data": data})
+    return fake_get
+
+
+# ==============================
+# REDIS
+# ==============================
+def _patch_redis(redis_url: str = None):
+    """Use fakeredis unless a real (local) Redis URL is given."""
+    if redis_url:
+        os.environ["REDIS_URL"] = redis_url
+        return None
+
+    import fakeredis
+    import redis
+    import redis.asyncio
+
+    server = fakeredis.FakeServer()
+    fake_async = getattr(fakeredis, "FakeAsyncRedis", None) or fakeredis.aioredis.FakeRedis
+
+    redis.Redis.from_url = classmethod(
+        lambda cls, url, **kwargs: fakeredis.FakeRedis(server=server, decode_responses=True)
+    )
+    redis.asyncio.Redis.from_url = classmethod(
+        lambda cls, url, **kwargs: fake_async(server=server, decode_responses=True)
+    )
+    os.environ["REDIS_URL"] = "redis://fake:6379/0"
+    return server
+
+
+# ==============================
+# ENTRY POINT
+# ==============================
+def install_fakes(latency: FakeLatency = None, redis_url: str = None, real_encoder: bool = False):
+    """Replace external services with fakes. Call before importing `backend`."""
+    if any(name.startswith("backend.") for name in sys.modules):
+        raise RuntimeError("install_fakes() must run before importing backend modules")
+
+    if latency is not None:
+        LATENCY.__dict__.update(latency.__dict__)
+
+    os.environ.setdefault("GOOGLE_API_KEY", "fake-google-key")
+    os.environ.setdefault("PINECONE_API_KEY", "fake-pinecone-key")
+    os.environ.setdefault("RAPIDAPI_KEY", "fake-rapidapi-key")
+    os.environ.setdefault("CATALOG_SNAPSHOT_DIR", os.path.join(os.getcwd(), ".bench_catalog"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Lets benchmark requests name their virtual clients with X-Client-Id.
+    os.environ.setdefault("FRONTEND_SECRET", FRONTEND_SECRET)
+    # Hashed bag-of-words scores run lower than the real encoder's.
+    os.environ.setdefault("JOB_INDEX_MIN_SCORE", "0.2")
+
+    google, genai = _fake_genai_module()
+    sys.modules["google"] = google
+    sys.modules["google.generativeai"] = genai
+    sys.modules["pinecone"] = _fake_pinecone_module()
+    package, loaders = _fake_langchain_modules()
+    sys.modules["langchain_community"] = package
+    sys.modules["langchain_community.document_loaders"] = loaders
+
+    if not real_encoder:
+        module = types.ModuleType("sentence_transformers")
+        module.SentenceTransformer = FakeSentenceTransformer
+        sys.modules["sentence_transformers"] = module
+
+    import requests
+    requests.get = make_fake_requests_get(requests.get)
+
+    return _patch_redis(redis_url)
@@ -0,0 +1,300 @@
+"""
+Offline benchmark for the CareerPath API.
+
+Runs the FastAPI app in-process against deterministic fakes (see fakes.py)
+and records throughput and latency percentiles for /analyze and /jobmatch
+(cold and warm cache, conditional revalidation, cursor pagination, and
+served from a pre-synced job index), plus raw encoder throughput, as JSON.
+
+Usage:
+    python -m benchmarks.run --requests 100 --concurrency 8 --output bench.json
+    python -m benchmarks.compare base.json bench.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import uuid
+
+import numpy as np
+
+from benchmarks import fakes
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    if not latencies:
+        return {}
+    arr = np.asarray(latencies) * 1000
+    return {
+        "mean_ms": round(float(arr.mean()), 2),
+        "p50_ms": round(float(np.percentile(arr, 50)), 2),
+        "p90_ms": round(float(np.percentile(arr, 90)), 2),
+        "p95_ms": round(float(np.percentile(arr, 95)), 2),
+        "p99_ms": round(float(np.percentile(arr, 99)), 2),
+        "max_ms": round(float(arr.max()), 2),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+# ==============================
+# SCENARIO RUNNER
+# ==============================
+async def run_load(name: str, send, n_requests: int, concurrency: int) -> dict:
+    """Fire n_requests calls of send(i) with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses, sizes = [], {}, []
+    calls_before = dict(fakes.CALL_COUNTS)
+
+    async def _one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await send(i)
+                status = response.status_code
+                # Bytes on the wire (httpx transparently decompresses .content).
+                sizes.append(int(response.headers.get("content-length", len(response.content))))
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(_one(i) for i in range(n_requests)))
+    wall = time.perf_counter() - wall_start
+
+    ok = statuses.get("200", 0)
+    result = {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "statuses": statuses,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(n_requests / wall, 2) if wall else 0.0,
+        "goodput_rps": round(ok / wall, 2) if wall else 0.0,
+        "response_bytes_mean": round(float(np.mean(sizes)), 1) if sizes else 0.0,
+        **_percentiles(latencies),
+        "service_calls": {
+            k: fakes.CALL_COUNTS[k] - calls_before.get(k, 0) for k in fakes.CALL_COUNTS
+        },
+    }
+    print(
+        f"{name:<18} {result['throughput_rps']:>8.1f} rps  "
+        f"p50={result.get('p50_ms', 0):>8.1f}ms  p95={result.get('p95_ms', 0):>8.1f}ms  "
+        f"statuses={statuses}"
+    )
+    return result
+
+
+def bench_encoder(n_texts: int = 512) -> dict:
+    from backend.utils.embeddings import get_embedding_model
+
+    model = get_embedding_model()
+    texts = [f"{fakes._SKILL_POOL[i % len(fakes._SKILL_POOL)]} engineer {i}" for i in range(n_texts)]
+    results = {}
+    for batch_size in (1, 32, 128):
+        start = time.perf_counter()
+        for i in range(0, n_texts, batch_size):
+            model.encode(texts[i:i + batch_size], normalize_embeddings=True)
+        elapsed = time.perf_counter() - start
+        results[f"batch_{batch_size}"] = {"texts_per_s": round(n_texts / elapsed, 1)}
+        print(f"encoder batch={batch_size:<4} {n_texts / elapsed:>10.1f} texts/s")
+    return results
+
+
+# ==============================
+# MAIN
+# ==============================
+async def run_benchmarks(args) -> dict:
+    import httpx
+    from backend.main import app
+    from backend.job_sync import sync_all
+    from backend.utils.cache_manager import clear_local_cache
+    from backend.utils.redis_client import async_redis_client
+
+    async def reset_caches():
+        await async_redis_client.flushdb()
+        clear_local_cache()
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+
+    def virtual_client(i) -> str:
+        # Each request is a different user, so per-client quotas are checked
+        # on every request without throttling the load itself.
+        return uuid.uuid4().hex
+
+    def client_headers(client_id: str) -> dict:
+        return {"X-Client-Id": client_id, "X-Frontend-Secret": fakes.FRONTEND_SECRET}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        def analyze(role_for, client_for=virtual_client):
+            async def _send(i):
+                # Unique bytes per upload: measure the pipeline, not the
+                # per-resume analysis cache.
+                resume_id = uuid.uuid4().hex
+                return await client.post(
+                    "/analyze",
+                    files={"file": (f"resume-{resume_id}.pdf", f"%PDF-1.4 {resume_id}".encode(), "application/pdf")},
+                    data={"target_role": role_for(i)},
+                    headers=client_headers(client_for(i)),
+                )
+            return _send
+
+        def jobmatch(role_for, pages_for=lambda i: 1, etags=None, cursors=None,
+                     client_for=virtual_client, method="POST"):
+            async def _send(i):
+                role = role_for(i)
+                headers = client_headers(client_for(i))
+                if etags:
+                    headers["If-None-Match"] = etags[role]
+                options = {
+                    "target_role": role,
+                    "country": "us",
+                    "remote": False,
+                    "date_posted": "all",
+                    "num_pages": pages_for(i),
+                    "max_description": 400,
+                }
+                if cursors:
+                    options["cursor"] = cursors[role]
+                if method == "GET":
+                    return await client.get("/jobmatch", headers=headers, params=options)
+                return await client.post("/jobmatch", headers=headers, json=options)
+            return _send
+
+        hot_roles = [f"Hot Role {i}" for i in range(args.hot_roles)]
+
+        for endpoint, make_send in (("analyze", analyze), ("jobmatch", jobmatch)):
+            # Cold: every request is for a role nothing has been cached or indexed
+            # for (one unique token, so fake embeddings match no indexed posting).
+            await reset_caches()
+            results[f"{endpoint}_cold"] = await run_load(
+                f"{endpoint}_cold",
+                make_send(lambda i: f"ColdRole-{uuid.uuid4().hex[:8]}"),
+                args.requests, args.concurrency,
+            )
+
+            # Warm: prime a small set of popular roles, then hammer them.
+            await reset_caches()
+            prime = make_send(lambda i: hot_roles[i])
+            for i in range(len(hot_roles)):
+                await prime(i)
+            results[f"{endpoint}_warm"] = await run_load(
+                f"{endpoint}_warm",
+                make_send(lambda i: hot_roles[i % len(hot_roles)]),
+                args.requests, args.concurrency,
+            )
+
+        # Revalidation: GET clients re-send the ETag they already hold (304s).
+        etags = {}
+        for i, role in enumerate(hot_roles):
+            etags[role] = (await jobmatch(lambda _: role, method="GET")(i)).headers.get("etag")
+        results["jobmatch_revalidate"] = await run_load(
+            "jobmatch_revalidate",
+            jobmatch(lambda i: hot_roles[i % len(hot_roles)], etags=etags, method="GET"),
+            args.requests, args.concurrency,
+        )
+
+        # Next page: "load more" with the cursor from the first page.
+        cursors = {}
+        for i, role in enumerate(hot_roles):
+            cursors[role] = (await jobmatch(lambda _: role)(i)).json()["next_cursor"]
+        results["jobmatch_next_page"] = await run_load(
+            "jobmatch_next_page",
+            jobmatch(lambda i: hot_roles[i % len(hot_roles)], cursors=cursors),
+            args.requests, args.concurrency,
+        )
+
+        # Indexed: popular roles synced into the job index ahead of time. Each
+        # request uses a distinct num_pages so it misses the result cache and
+        # is served by an index query alone.
+        await reset_caches()
+        await sync_all(hot_roles, ["us"], max_pages=2)
+        results["jobmatch_indexed"] = await run_load(
+            "jobmatch_indexed",
+            jobmatch(lambda i: hot_roles[i % len(hot_roles)], pages_for=lambda i: i + 1),
+            args.requests, args.concurrency,
+        )
+
+        # Quota: one client far over its burst; everything past
+        # CLIENT_QUOTA_BURST should be a cheap 429.
+        results["jobmatch_quota"] = await run_load(
+            "jobmatch_quota",
+            jobmatch(lambda i: hot_roles[i % len(hot_roles)], client_for=lambda i: "bench-heavy-client"),
+            args.requests, args.concurrency,
+        )
+
+        # Overload: far more concurrent cold requests than the API admits.
+        # Goodput here should stay close to analyze_cold's.
+        if args.overload_factor > 1:
+            await reset_caches()
+            results["analyze_overload"] = await run_load(
+                "analyze_overload",
+                analyze(lambda i: f"ColdRole-{uuid.uuid4().hex[:8]}"),
+                args.requests * args.overload_factor,
+                args.concurrency * args.overload_factor,
+            )
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--hot-roles", type=int, default=5)
+    parser.add_argument("--overload-factor", type=int, default=4,
+                        help="Concurrency multiplier for the overload scenario (1 disables)")
+    parser.add_argument("--gemini-latency", type=float, default=fakes.LATENCY.gemini)
+    parser.add_argument("--jsearch-latency", type=float, default=fakes.LATENCY.jsearch)
+    parser.add_argument("--vector-latency", type=float, default=fakes.LATENCY.vector_store)
+    parser.add_argument("--encoder-latency", type=float, default=fakes.LATENCY.encoder_per_text,
+                        help="Simulated encoder cost per text")
+    parser.add_argument("--real-encoder", action="store_true",
+                        help="Use the real sentence-transformers model")
+    parser.add_argument("--redis-url", help="Local Redis to use instead of fakeredis")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    fakes.install_fakes(
+        fakes.FakeLatency(
+            gemini=args.gemini_latency,
+            jsearch=args.jsearch_latency,
+            vector_store=args.vector_latency,
+            encoder_per_text=args.encoder_latency,
+        ),
+        redis_url=args.redis_url,
+        real_encoder=args.real_encoder,
+    )
+
+    scenarios = {"encoder": bench_encoder()}
+    scenarios.update(asyncio.run(run_benchmarks(args)))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "config": vars(args),
+        },
+        "scenarios": scenarios,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+CareerPath backend client for the Streamlit app.
+
+- Pooled `requests` sessions per server process (`st.cache_resource`),
+  with timeouts and retries on transient gateway/overload errors. POSTs
+  are only retried when the backend refused them before doing any work.
+- Results are memoized per browser session (file hash + role for analysis,
+  role + filters + cursor for job pages), so Streamlit reruns triggered by
+  widget changes never repeat a backend call.
+- Every request carries a per-browser-session `X-Client-Id`. With the
+  backend's FRONTEND_SECRET set as CAREERPATH_API_FRONTEND_SECRET, the
+  backend trusts it and its per-client quota applies to each user rather
+  than to this server's IP.
+- Job searches run on a small thread pool, so the first page can load while
+  the analysis tabs render.
+"""
+import hashlib
+import os
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ==============================
+# CONFIGURATION
+# ==============================
+BACKEND_URL = os.getenv("CAREERPATH_API_URL", "http://127.0.0.1:8000").rstrip("/")
+CONNECT_TIMEOUT = float(os.getenv("CAREERPATH_API_CONNECT_TIMEOUT", 5))
+ANALYZE_TIMEOUT = float(os.getenv("CAREERPATH_API_ANALYZE_TIMEOUT", 180))
+JOBMATCH_TIMEOUT = float(os.getenv("CAREERPATH_API_JOBMATCH_TIMEOUT", 60))
+RETRIES = int(os.getenv("CAREERPATH_API_RETRIES", 2))
+POOL_SIZE = int(os.getenv("CAREERPATH_API_POOL_SIZE", 10))
+FRONTEND_SECRET = os.getenv("CAREERPATH_API_FRONTEND_SECRET", "")
+
+# Job fields the UI renders, and how much of each description it shows.
+JOB_FIELDS = "title,company,description,link,score"
+JOB_DESCRIPTION_CHARS = 400
+JOB_PAGE_SIZE = 5
+
+
+class BackendError(Exception):
+    pass
+
+
+class ResultsExpired(BackendError):
+    """The backend rebuilt the ranking a 'load more' cursor pointed into."""
+
+
+# ==============================
+# SHARED RESOURCES
+# ==============================
+def _pooled_session(method: str, status_forcelist: tuple) -> requests.Session:
+    retry = Retry(
+        total=RETRIES,
+        connect=RETRIES,
+        read=0,  # never re-run a request the backend may already be processing
+        status=RETRIES,
+        status_forcelist=status_forcelist,
+        allowed_methods=frozenset({method}),
+        backoff_factor=0.5,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Pooled session for GETs, shared by every browser session of this server."""
+    return _pooled_session("GET", (429, 502, 503, 504))
+
+
+@st.cache_resource
+def get_post_session() -> requests.Session:
+    """
+    Pooled session for POSTs. A 502/504 may come after the backend already
+    ran the request, so only 429 (quota) and 503 (admission control), which
+    are sent before any work starts, are retried.
+    """
+    return _pooled_session("POST", (429, 503))
+
+
+@st.cache_resource
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="careerpath-api")
+
+
+def _memo(name: str) -> dict:
+    """Per-browser-session memo table."""
+    return st.session_state.setdefault(f"_api_{name}", {})
+
+
+def _client_headers() -> dict:
+    """Per-browser-session id the backend keys its per-client quota on."""
+    headers = {"X-Client-Id": st.session_state.setdefault("_api_client_id", uuid.uuid4().hex)}
+    if FRONTEND_SECRET:
+        headers["X-Frontend-Secret"] = FRONTEND_SECRET
+    return headers
+
+
+def _error_message(response: requests.Response) -> str:
+    try:
+        body = response.json()
+    except ValueError:
+        return f"Server error: {response.status_code}"
+    return str(body.get("detail") or body.get("error") or f"Server error: {response.status_code}")
+
+
+# ==============================
+# RESUME ANALYSIS
+# ==============================
+def analyze_resume(file_bytes: bytes, filename: str, target_role: str) -> dict:
+    """POST /analyze, memoized by (file hash, role) for this browser session."""
+    key = (hashlib.sha1(file_bytes).hexdigest(), target_role.strip().lower())
+    memo = _memo("analysis")
+    if key in memo:
+        return memo[key]
+
+    response = get_post_session().post(
+        f"{BACKEND_URL}/analyze",
+        files={"file": (filename, file_bytes, "application/pdf")},
+        data={"target_role": target_role.strip()},
+        headers=_client_headers(),
+        timeout=(CONNECT_TIMEOUT, ANALYZE_TIMEOUT),
+    )
+    if response.status_code != 200:
+        raise BackendError(_error_message(response))
+    result = response.json()
+    if "error" in result:
+        raise BackendError(result["error"])
+
+    memo[key] = result
+    return result
+
+
+# ==============================
+# JOB MATCHES
+# ==============================
+def job_search_params(target_role: str, country: str, remote: bool, date_posted: str, num_pages: int) -> dict:
+    return {
+        "target_role": target_role.strip(),
+        "country": country,
+        "remote": remote,
+        "date_posted": date_posted,
+        "num_pages": num_pages,
+        "fields": JOB_FIELDS,
+        "max_description": JOB_DESCRIPTION_CHARS,
+        "page_size": JOB_PAGE_SIZE,
+    }
+
+
+def _search_key(params: dict) -> tuple:
+    return tuple(sorted(params.items()))
+
+
+def _fetch_job_page(session: requests.Session, params: dict, headers: dict, cursor: str = None) -> dict:
+    """GET /jobmatch for one page (no Streamlit calls: runs on worker threads)."""
+    query = {**params, "cursor": cursor} if cursor else params
+    response = session.get(
+        f"{BACKEND_URL}/jobmatch",
+        params=query,
+        headers=headers,
+        timeout=(CONNECT_TIMEOUT, JOBMATCH_TIMEOUT),
+    )
+    if response.status_code == 410:
+        raise ResultsExpired(_error_message(response))
+    if response.status_code != 200:
+        raise BackendError(_error_message(response))
+    return response.json()
+
+
+def start_job_search(params: dict) -> Future:
+    """
+    Start fetching the first page of a job search in the background. Calling
+    it again with the same params reuses the running or finished request.
+    """
+    searches = _memo("job_searches")
+    key = _search_key(params)
+    if key not in searches:
+        searches[key] = {
+            "first": _executor().submit(_fetch_job_page, get_session(), params, _client_headers()),
+            "more": [],
+        }
+    return searches[key]["first"]
+
+
+def forget_job_search(params: dict):
+    _memo("job_searches").pop(_search_key(params), None)
+
+
+def job_search_results(params: dict):
+    """
+    Every page loaded so far for a started search, combined:
+    {"matches", "next_cursor", "total"}. None if the search was never
+    started. Blocks until the first page has arrived.
+    """
+    search = _memo("job_searches").get(_search_key(params))
+    if search is None:
+        return None
+    try:
+        pages = [search["first"].result()] + search["more"]
+    except Exception:
+        # Let a retry (e.g. pressing "Fetch" again) start a fresh request.
+        forget_job_search(params)
+        raise
+    return {
+        "matches": [job for page in pages for job in page.get("matches", [])],
+        "next_cursor": pages[-1].get("next_cursor"),
+        "total": pages[0].get("total", 0),
+    }
+
+
+def load_more_jobs(params: dict):
+    """Fetch the next page of a started search and append it."""
+    search = _memo("job_searches").get(_search_key(params))
+    current = job_search_results(params)
+    if search is None or not current or not current["next_cursor"]:
+        return
+    search["more"].append(
+        _fetch_job_page(get_session(), params, _client_headers(), current["next_cursor"])
+    )
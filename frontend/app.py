@@ -1,13 +1,33 @@
 import streamlit as st
-import requests
+
+import api_client
 
 # ==============================
 # CONFIGURATION
 # ==============================
 st.set_page_config(page_title="CareerPath – AI Career Navigator", page_icon="💼", layout="wide")
 
-BACKEND_ANALYZE_URL = "http://127.0.0.1:8000/analyze"
-BACKEND_JOBMATCH_URL = "http://127.0.0.1:8000/jobmatch"
+# Job filter widgets (keys and defaults), also used to prefetch jobs.
+COUNTRIES = ["us", "in", "ca", "uk", "de", "au"]
+DATE_POSTED = ["today", "3days", "week", "month", "all"]
+JOB_FILTER_DEFAULTS = {
+    "country_filter": "in",
+    "remote_filter": False,
+    "date_filter": "all",
+    "pages_filter": 1,
+}
+
+
+def current_job_params(role: str) -> dict:
+    """Job search params for the filter values currently selected."""
+    state = {k: st.session_state.get(k, v) for k, v in JOB_FILTER_DEFAULTS.items()}
+    return api_client.job_search_params(
+        role,
+        state["country_filter"],
+        state["remote_filter"],
+        state["date_filter"],
+        state["pages_filter"],
+    )
 
 st.markdown(
     """
@@ -26,8 +46,8 @@ if "analyzed" not in st.session_state:
     st.session_state.analyzed = False
 if "result" not in st.session_state:
     st.session_state.result = {}
-if "job_results" not in st.session_state:
-    st.session_state.job_results = []
+if "analyzed_role" not in st.session_state:
+    st.session_state.analyzed_role = ""
 
 # ==============================
 # SIDEBAR — INPUTS
@@ -48,20 +68,17 @@ if analyze_btn:
     else:
         with st.spinner("Analyzing your resume with AI... 🔍"):
             try:
-                files = {"file": uploaded_file}
-                data = {"target_role": target_role}
-                response = requests.post(BACKEND_ANALYZE_URL, files=files, data=data)
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if "error" in result:
-                        st.error(result["error"])
-                    else:
-                        st.session_state.analyzed = True
-                        st.session_state.result = result
-                        st.success("✅ Resume analyzed successfully!")
-                else:
-                    st.error(f"❌ Server error: {response.status_code}")
+                result = api_client.analyze_resume(
+                    uploaded_file.getvalue(), uploaded_file.name, target_role
+                )
+                st.session_state.analyzed = True
+                st.session_state.result = result
+                st.session_state.analyzed_role = target_role.strip()
+                # Matching jobs load in the background while the tabs render.
+                api_client.start_job_search(current_job_params(target_role))
+                st.success("✅ Resume analyzed successfully!")
+            except api_client.BackendError as e:
+                st.error(f"❌ {e}")
             except Exception as e:
                 st.error(f"💥 Backend connection failed: {e}")
 
@@ -70,6 +87,7 @@ if analyze_btn:
 # ============================================
 if st.session_state.analyzed:
     result = st.session_state.result
+    analyzed_role = st.session_state.analyzed_role
     tabs = st.tabs(["📊 Summary", "🧠 Extracted Info", "🎓 Learning Roadmap", "💼 Job Matches"])
 
     # ------------------ TAB 1 ------------------
@@ -77,7 +95,7 @@ if st.session_state.analyzed:
         st.markdown("### 📋 Overview Summary")
         st.markdown(
             f"<div style='background-color:#1E293B; padding:15px; border-radius:10px; color:#E2E8F0;'>"
-            f"<b>🎯 Target Role:</b> {target_role}<br>"
+            f"<b>🎯 Target Role:</b> {analyzed_role}<br>"
             f"<b>📊 Match Score:</b> {result.get('match_score', 0):.2f}%<br>"
             f"</div>",
             unsafe_allow_html=True,
@@ -154,43 +172,49 @@ if st.session_state.analyzed:
 
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            country = st.selectbox("🌍 Country", ["us", "in", "ca", "uk", "de", "au"], index=1, key="country_filter")
+            country = st.selectbox(
+                "🌍 Country", COUNTRIES,
+                index=COUNTRIES.index(JOB_FILTER_DEFAULTS["country_filter"]), key="country_filter",
+            )
         with col2:
-            remote_only = st.checkbox("💻 Remote Only", value=False, key="remote_filter")
+            remote_only = st.checkbox("💻 Remote Only", value=JOB_FILTER_DEFAULTS["remote_filter"], key="remote_filter")
         with col3:
-            date_posted = st.selectbox("🗓️ Date Posted", ["today", "3days", "week", "month", "all"], index=4, key="date_filter")
+            date_posted = st.selectbox(
+                "🗓️ Date Posted", DATE_POSTED,
+                index=DATE_POSTED.index(JOB_FILTER_DEFAULTS["date_filter"]), key="date_filter",
+            )
         with col4:
-            num_pages = st.slider("📄 Results Pages", 1, 5, 1, key="pages_filter")
+            num_pages = st.slider(
+                "📄 Live search depth (pages)", 1, 5, JOB_FILTER_DEFAULTS["pages_filter"],
+                key="pages_filter",
+                help="JSearch pages to pull when the job index has too few matches. "
+                     "Use 'Load more' below the results to see more jobs.",
+            )
 
         fetch_jobs = st.button("🔎 Fetch Matching Jobs", use_container_width=True, key="fetch_button")
 
+        job_params = api_client.job_search_params(
+            analyzed_role, country, remote_only, date_posted, num_pages
+        )
         if fetch_jobs:
-            try:
-                with st.spinner("Fetching latest job openings..."):
-                    job_params = {
-                        "target_role": target_role.strip(),
-                        "country": country,
-                        "remote": remote_only,
-                        "date_posted": date_posted,
-                        "num_pages": num_pages
-                    }
-
-                    job_response = requests.post(BACKEND_JOBMATCH_URL, json=job_params, timeout=60)
-                    if job_response.status_code == 200:
-                        job_data = job_response.json()
-                        st.session_state.job_results = job_data.get("matches", [])
-                    else:
-                        st.warning("⚠️ Could not fetch job matches.")
-            except Exception as e:
-                st.error(f"💥 Error fetching job matches: {e}")
-
-        if st.session_state.job_results:
-            for job in st.session_state.job_results:
+            api_client.start_job_search(job_params)
+
+        job_data = None
+        try:
+            with st.spinner("Fetching latest job openings..."):
+                job_data = api_client.job_search_results(job_params)
+        except api_client.BackendError as e:
+            st.warning(f"⚠️ Could not fetch job matches: {e}")
+        except Exception as e:
+            st.error(f"💥 Error fetching job matches: {e}")
+
+        if job_data and job_data["matches"]:
+            for job in job_data["matches"]:
                 st.markdown(
                     f"""
                     <div style="background-color:#1e293b; padding:15px; border-radius:10px; margin-bottom:10px;">
                         <h4 style="color:#E2E8F0;">{job.get('title', 'Untitled Role')} — <span style="color:#94A3B8;">{job.get('company', 'Unknown')}</span></h4>
-                        <p style="color:#CBD5E1;">{job.get('description', '')[:400]}...</p>
+                        <p style="color:#CBD5E1;">{job.get('description', '')}</p>
                         <p style="color:#A3E635;">Match Score: {round(job.get('score', 0)*100, 2)}%</p>
                         {'<a href="'+job.get('link', '#')+'" target="_blank" style="color:#60A5FA;">🔗 Apply Here</a>' if job.get('link') else ''}
                     </div>
@@ -198,5 +222,24 @@ if st.session_state.analyzed:
                     unsafe_allow_html=True,
                 )
 
+            st.caption(f"Showing {len(job_data['matches'])} of {job_data['total']} matches")
+            if job_data["next_cursor"] and st.button("⬇️ Load more", use_container_width=True, key="load_more_button"):
+                loaded = False
+                try:
+                    with st.spinner("Loading more matches..."):
+                        api_client.load_more_jobs(job_params)
+                    loaded = True
+                except api_client.ResultsExpired:
+                    api_client.forget_job_search(job_params)
+                    st.warning("⚠️ Job results were refreshed — fetch them again.")
+                except Exception as e:
+                    st.error(f"💥 Error loading more matches: {e}")
+                if loaded:
+                    st.rerun()
+        elif job_data is None:
+            st.info("Press **Fetch Matching Jobs** to search with these filters.")
+        else:
+            st.info("No matching jobs found for these filters.")
+
 else:
     st.info("📎 Upload your resume and enter a target role to begin analysis.")
@@ -0,0 +1,43 @@
+"""
+Shared test setup: every external service (Redis, Gemini, Pinecone, JSearch,
+the encoder) is replaced by the offline fakes from benchmarks/fakes.py.
+This has to happen before any `backend` module is imported.
+"""
+import os
+import sys
+import time
+
+import fakeredis
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fakes  # noqa: E402
+
+FAKE_REDIS_SERVER = fakes.install_fakes(fakes.FakeLatency(0, 0, 0, 0, 0))
+
+
+@pytest.fixture(autouse=True)
+def _flush_fake_redis():
+    yield
+    fakeredis.FakeRedis(server=FAKE_REDIS_SERVER).flushall()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", 'clock(name): time function the `clock` fixture replaces (default "monotonic")'
+    )
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """
+    Frozen, settable clock: `clock[0]` is the current time; advance it with
+    `clock[0] += seconds`. Replaces time.monotonic, or the time function
+    named by a `@pytest.mark.clock("time")` marker on the test or module.
+    """
+    marker = request.node.get_closest_marker("clock")
+    name = marker.args[0] if marker else "monotonic"
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(time, name, lambda: now[0])
+    return now
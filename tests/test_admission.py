@@ -0,0 +1,205 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, File, UploadFile
+
+from backend.utils.admission import AdmissionMiddleware, ClientQuota, EndpointLimiter, Rejected
+
+
+# ==============================
+# ClientQuota (token bucket Lua script)
+# ==============================
+def _check(quota, client_id):
+    try:
+        asyncio.run(quota.check(client_id))
+    except Rejected as r:
+        return r
+    return None
+
+
+@pytest.mark.clock("time")
+def test_quota_allows_a_burst_then_rejects(clock):
+    quota = ClientQuota(per_minute=60, burst=3)
+    assert [_check(quota, "ip:1") for _ in range(3)] == [None, None, None]
+
+    rejected = _check(quota, "ip:1")
+    assert (rejected.status, rejected.reason, rejected.retry_after) == (429, "quota_exceeded", 1)
+
+
+@pytest.mark.clock("time")
+def test_quota_buckets_are_per_client(clock):
+    quota = ClientQuota(per_minute=60, burst=1)
+    assert _check(quota, "client:a") is None
+    assert _check(quota, "client:a") is not None
+    assert _check(quota, "client:b") is None
+
+
+@pytest.mark.clock("time")
+def test_quota_refills_over_time(clock):
+    quota = ClientQuota(per_minute=30, burst=2)  # one token every 2s
+    _check(quota, "ip:1")
+    _check(quota, "ip:1")
+    assert _check(quota, "ip:1").retry_after == 2
+
+    clock[0] += 2
+    assert _check(quota, "ip:1") is None
+    assert _check(quota, "ip:1") is not None
+
+
+# ==============================
+# Quota client identity
+# ==============================
+def _quota_statuses(requests: list[dict]) -> list[int]:
+    app = FastAPI()
+
+    @app.get("/x")
+    async def endpoint():
+        return {}
+
+    guarded_app = AdmissionMiddleware(
+        app,
+        limiters={"/x": EndpointLimiter(10, 10, 1)},
+        quota=ClientQuota(per_minute=60, burst=2),
+        api_keys={"known-key"},
+        frontend_secret="frontend-secret",
+    )
+
+    async def run():
+        transport = httpx.ASGITransport(app=guarded_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [(await client.get("/x", headers=headers)).status_code for headers in requests]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.clock("time")
+@pytest.mark.parametrize("rotating_header", ["X-Client-Id", "X-API-Key"])
+def test_rotating_headers_does_not_escape_the_bucket(clock, rotating_header):
+    requests = [{rotating_header: f"id-{i}"} for i in range(4)]
+    assert _quota_statuses(requests) == [200, 200, 429, 429]
+
+
+@pytest.mark.clock("time")
+def test_wrong_frontend_secret_is_ignored(clock):
+    requests = [{"X-Client-Id": f"user-{i}", "X-Frontend-Secret": "guess"} for i in range(3)]
+    assert _quota_statuses(requests) == [200, 200, 429]
+
+
+@pytest.mark.clock("time")
+def test_trusted_ids_get_their_own_buckets(clock):
+    trusted = [
+        {"X-Client-Id": f"user-{i}", "X-Frontend-Secret": "frontend-secret"} for i in range(3)
+    ]
+    known_key = [{"X-API-Key": "known-key"}] * 3
+    # Peer-IP bucket: 2 requests; each trusted user: its own bucket; the key: 2 more.
+    assert _quota_statuses([{}, {}] + trusted + known_key) == [200, 200, 200, 200, 200, 200, 200, 429]
+
+
+# ==============================
+# EndpointLimiter
+# ==============================
+def test_limiter_queues_then_rejects():
+    async def run():
+        limiter = EndpointLimiter(max_concurrency=1, max_queue=1, queue_timeout=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected) as full:
+            await limiter.acquire()
+
+        limiter.release(0.5)
+        await waiter
+        return full.value, limiter.active, limiter.waiting
+
+    rejected, active, waiting = asyncio.run(run())
+    assert (rejected.status, rejected.reason) == (503, "queue_full")
+    assert rejected.retry_after >= 1
+    assert (active, waiting) == (1, 0)
+
+
+def test_limiter_times_out_queued_requests():
+    async def run():
+        limiter = EndpointLimiter(max_concurrency=1, max_queue=5, queue_timeout=0.01)
+        await limiter.acquire()
+        with pytest.raises(Rejected) as timed_out:
+            await limiter.acquire()
+        return timed_out.value, limiter.waiting
+
+    rejected, waiting = asyncio.run(run())
+    assert rejected.reason == "queue_timeout"
+    assert waiting == 0
+
+
+# ==============================
+# AdmissionMiddleware upload limit
+# ==============================
+def _upload_app(max_bytes: int):
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return AdmissionMiddleware(app, limiters={}, upload_limits={"/upload": max_bytes})
+
+
+def _multipart(payload: bytes) -> bytes:
+    return (
+        b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"r.pdf\"\r\n"
+        b"Content-Type: application/pdf\r\n\r\n" + payload + b"\r\n--b--\r\n"
+    )
+
+
+def _post(app, body: bytes, content_length=None, chunk_size=64):
+    headers = [(b"content-type", b"multipart/form-data; boundary=b")]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    scope = {
+        "type": "http", "method": "POST", "path": "/upload", "raw_path": b"/upload",
+        "query_string": b"", "headers": headers, "client": ("127.0.0.1", 1234),
+        "server": ("test", 80), "scheme": "http", "http_version": "1.1", "root_path": "",
+    }
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+        for i, c in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    starts = [m for m in sent if m["type"] == "http.response.start"]
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    assert len(starts) == 1
+    return starts[0]["status"], json.loads(body)
+
+
+def test_small_upload_passes():
+    body = _multipart(b"x" * 100)
+    assert _post(_upload_app(1000), body, len(body)) == (200, {"size": 100})
+
+
+def test_rejects_large_content_length_before_reading():
+    status, payload = _post(_upload_app(1000), b"", content_length=5000)
+    assert status == 413
+    assert payload["error"] == "upload too large"
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_rejects_invalid_content_length(length):
+    status, payload = _post(_upload_app(1000), b"", content_length=length)
+    assert status == 400
+    assert payload["error"] == "invalid content length"
+
+
+def test_rejects_streamed_body_over_the_limit():
+    status, payload = _post(_upload_app(1000), _multipart(b"x" * 5000))
+    assert status == 413
+    assert payload["error"] == "upload too large"
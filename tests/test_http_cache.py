@@ -0,0 +1,91 @@
+import pytest
+from starlette.requests import Request
+
+from backend.utils.http_cache import (
+    content_version,
+    etag_matches,
+    json_response,
+    make_etag,
+    parse_fields,
+)
+
+
+# ==============================
+# make_etag / content_version
+# ==============================
+def test_etag_is_weak_and_stable():
+    etag = make_etag("abc123", "Data Scientist", ["title"])
+    assert etag.startswith('W/"abc123-') and etag.endswith('"')
+    assert etag == make_etag("abc123", "Data Scientist", ["title"])
+    assert make_etag("abc123") == 'W/"abc123"'
+
+
+def test_etag_changes_with_version_and_shaping():
+    base = make_etag("v1", "Data Scientist", None, 400)
+    assert make_etag("v2", "Data Scientist", None, 400) != base
+    assert make_etag("v1", "Data Scientist", ["title"], 400) != base
+    assert make_etag("v1", "Data Scientist", None, 200) != base
+
+
+def test_content_version_ignores_key_order():
+    assert content_version({"a": 1, "b": [1, 2]}) == content_version({"b": [1, 2], "a": 1})
+    assert content_version({"a": 1}) != content_version({"a": 2})
+
+
+# ==============================
+# etag_matches
+# ==============================
+@pytest.mark.parametrize("header", [
+    'W/"v1"',
+    '"v1"',
+    '"other", W/"v1"',
+    "*",
+])
+def test_etag_matches(header):
+    assert etag_matches(header, 'W/"v1"')
+
+
+@pytest.mark.parametrize("header", [None, "", 'W/"v2"', '"v1-x"'])
+def test_etag_does_not_match(header):
+    assert not etag_matches(header, 'W/"v1"')
+
+
+# ==============================
+# json_response
+# ==============================
+def _request(method: str, if_none_match: str = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers, "query_string": b""})
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD"])
+def test_conditional_get_returns_304(method):
+    response = json_response(_request(method, 'W/"v1"'), 'W/"v1"', lambda: {"a": 1}, "no-cache")
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+def test_post_ignores_if_none_match():
+    response = json_response(_request("POST", 'W/"v1"'), 'W/"v1"', lambda: {"a": 1}, "no-cache")
+    assert response.status_code == 200
+    assert response.body == b'{"a":1}'
+    assert response.headers["etag"] == 'W/"v1"'
+
+
+# ==============================
+# parse_fields
+# ==============================
+@pytest.mark.parametrize("fields, expected", [
+    (None, []),
+    ("", []),
+    ("title, link,", ["title", "link"]),
+    (["title", " score "], ["title", "score"]),
+])
+def test_parse_fields(fields, expected):
+    assert parse_fields(fields) == expected
+
+
+@pytest.mark.parametrize("fields", [5, {"title": True}, ["title", 5]])
+def test_parse_fields_rejects_other_types(fields):
+    with pytest.raises(ValueError):
+        parse_fields(fields)
@@ -0,0 +1,63 @@
+import asyncio
+import base64
+
+import httpx
+import pytest
+
+from backend.chains.job_match_agent import InvalidCursor, _decode_cursor, _encode_cursor
+
+
+# ==============================
+# CURSORS
+# ==============================
+def test_cursor_round_trip():
+    cursor = _encode_cursor("0123456789abcdef", 15)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == ("0123456789abcdef", 15)
+
+
+def _raw_cursor(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "!!not-base64!!",
+    _raw_cursor("no-offset"),
+    _raw_cursor("v1:ten"),
+    _raw_cursor("v1:-5"),
+    base64.urlsafe_b64encode(b"\xff\xfe:1").decode(),
+    12,
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        _decode_cursor(cursor)
+
+
+# ==============================
+# /jobmatch REQUEST VALIDATION
+# ==============================
+def _post_jobmatch(payload: dict) -> httpx.Response:
+    from backend.main import app
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/jobmatch", json={"target_role": "Data Scientist", **payload})
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("payload", [
+    {"page_size": "many"},
+    {"page_size": 0},
+    {"page_size": -1},
+    {"max_description": "long"},
+    {"max_description": 0},
+    {"max_description": -150},
+    {"fields": 5},
+    {"fields": ["title", 5]},
+    {"cursor": _raw_cursor("v1:-5")},
+])
+def test_jobmatch_rejects_bad_paging_options(payload):
+    response = _post_jobmatch(payload)
+    assert response.status_code == 400
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from benchmarks import fakes
+from backend import job_sync
+from backend.utils.job_index import index_filter, index_postings
+
+pytestmark = pytest.mark.clock("time")
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+# ==============================
+# WATERMARKS
+# ==============================
+@pytest.mark.parametrize("age, bucket", [
+    (None, "all"),
+    (60, "today"),
+    (2 * DAY, "3days"),
+    (5 * DAY, "week"),
+    (20 * DAY, "month"),
+    (60 * DAY, "all"),
+])
+def test_date_posted_since_picks_the_narrowest_bucket(clock, age, bucket):
+    watermark = 0 if age is None else int(clock[0]) - age
+    assert job_sync.date_posted_since(watermark) == bucket
+
+
+def test_date_posted_since_keeps_slack_for_clock_skew(clock):
+    # 23.5 hours old is "today" without the slack, but not with it.
+    assert job_sync.date_posted_since(int(clock[0] - 23.5 * HOUR)) == "3days"
+
+
+# ==============================
+# SYNC
+# ==============================
+def test_sync_stops_at_the_watermark_and_advances_it(clock):
+    role, country = "Sync Test Engineer", "us"
+
+    first = asyncio.run(job_sync.sync_query(role, country, max_pages=3))
+    assert first == {"pages": 3, "fetched": 30, "indexed": 30}
+    assert asyncio.run(job_sync.get_watermark(role, country)) == int(clock[0])
+
+    # Nothing newer: the first page is already at the watermark.
+    second = asyncio.run(job_sync.sync_query(role, country, max_pages=3))
+    assert second == {"pages": 1, "fetched": 10, "indexed": 0}
+
+    # Two hours later page 1 is newer, page 2 reaches back past the watermark.
+    clock[0] += 2 * HOUR
+    third = asyncio.run(job_sync.sync_query(role, country, max_pages=3))
+    assert third["pages"] == 2
+    assert asyncio.run(job_sync.get_watermark(role, country)) == int(clock[0])
+
+
+def test_full_sync_ignores_the_watermark(clock):
+    role, country = "Full Sync Engineer", "gb"
+    asyncio.run(job_sync.sync_query(role, country, max_pages=2))
+    stats = asyncio.run(job_sync.sync_query(role, country, max_pages=2, full=True))
+    assert stats["pages"] == 2
+
+
+# ==============================
+# INDEXING
+# ==============================
+def test_index_postings_skips_unchanged_postings(clock):
+    jobs = fakes.fake_jsearch_jobs("Hash Test Engineer jobs", "us", 1, per_page=4)
+    assert asyncio.run(index_postings(jobs, "us")) == 4
+
+    upserts = fakes.CALL_COUNTS["vector_upsert"]
+    assert asyncio.run(index_postings(jobs, "us")) == 0
+    assert fakes.CALL_COUNTS["vector_upsert"] == upserts
+
+    jobs[0] = {**jobs[0], "job_description": jobs[0]["job_description"] + " Updated."}
+    assert asyncio.run(index_postings(jobs, "us")) == 1
+
+
+def test_index_postings_ignores_empty_postings():
+    assert asyncio.run(index_postings([{"job_id": "empty"}], "us")) == 0
+
+
+# ==============================
+# QUERY FILTERS
+# ==============================
+def test_index_filter(clock):
+    now = int(clock[0])
+    assert index_filter("US") == {"country": "us"}
+    assert index_filter("us", remote=True) == {"country": "us", "remote": True}
+    assert index_filter("gb", date_posted="week") == {
+        "country": "gb",
+        "posted_at": {"$gte": now - 7 * DAY},
+    }
+    assert index_filter("us", date_posted="all") == {"country": "us"}
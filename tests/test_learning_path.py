@@ -0,0 +1,28 @@
+import asyncio
+import threading
+import time
+
+from backend.chains import learning_path_agent
+from backend.config import ROADMAP_MAX_CONCURRENCY
+
+
+def test_roadmap_generation_is_capped(monkeypatch):
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def slow_gemini(prompt, purpose="roadmap"):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return '{"course": {"name": "Course", "link": "https://example.com"}}'
+
+    monkeypatch.setattr(learning_path_agent, "_generate_with_gemini", slow_gemini)
+    skills = [f"Skill {i}" for i in range(ROADMAP_MAX_CONCURRENCY * 3)]
+
+    result = asyncio.run(learning_path_agent.generate_learning_path(skills))
+
+    assert list(result) == skills
+    assert state["peak"] <= ROADMAP_MAX_CONCURRENCY
@@ -0,0 +1,56 @@
+from backend.utils.local_cache import LocalCache
+
+
+def test_get_and_set(clock):
+    cache = LocalCache(max_items=4, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b", "default") == "default"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used(clock):
+    cache = LocalCache(max_items=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LocalCache(max_items=4, ttl=60)
+    cache.set("a", 1)
+    clock[0] += 60
+    assert cache.get("a") == 1
+    clock[0] += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_set_refreshes_ttl(clock):
+    cache = LocalCache(max_items=4, ttl=60)
+    cache.set("a", 1)
+    clock[0] += 50
+    cache.set("a", 2)
+    clock[0] += 50
+    assert cache.get("a") == 2
+
+
+def test_zero_size_cache_stores_nothing(clock):
+    cache = LocalCache(max_items=0, ttl=60)
+    cache.set("a", 1)
+    assert len(cache) == 0 and cache.get("a") is None
+
+
+def test_delete_and_clear(clock):
+    cache = LocalCache(max_items=4, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None and cache.get("b") == 2
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,79 @@
+import asyncio
+
+from backend.utils import redis_client
+from backend.utils.redis_client import CircuitBreaker, guarded
+
+
+# ==============================
+# CircuitBreaker
+# ==============================
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(max_failures=3, cooldown=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow() and not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(max_failures=2, cooldown=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open
+
+
+def test_breaker_lets_one_trial_through_after_cooldown(clock):
+    breaker = CircuitBreaker(max_failures=1, cooldown=30)
+    breaker.record_failure()
+    clock[0] += 29
+    assert not breaker.allow()
+
+    clock[0] += 1
+    assert breaker.allow()      # trial call
+    assert not breaker.allow()  # others wait for the trial's outcome
+
+    breaker.record_success()
+    assert not breaker.is_open and breaker.allow()
+
+
+def test_failed_trial_reopens_the_breaker(clock):
+    breaker = CircuitBreaker(max_failures=1, cooldown=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    clock[0] += 29
+    assert not breaker.allow()
+
+
+# ==============================
+# guarded()
+# ==============================
+def test_guarded_returns_default_and_stops_calling_when_open(monkeypatch, clock):
+    breaker = CircuitBreaker(max_failures=2, cooldown=30)
+    monkeypatch.setattr(redis_client, "redis_breaker", breaker)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise ConnectionError("redis down")
+
+    async def run():
+        return [await guarded("GET", failing, default="fallback") for _ in range(4)]
+
+    assert asyncio.run(run()) == ["fallback"] * 4
+    assert len(calls) == 2
+    assert breaker.is_open
+
+
+def test_guarded_returns_the_result_on_success(monkeypatch):
+    monkeypatch.setattr(redis_client, "redis_breaker", CircuitBreaker(2, 30))
+
+    async def ok():
+        return "value"
+
+    assert asyncio.run(guarded("GET", ok)) == "value"
@@ -0,0 +1,60 @@
+import asyncio
+
+from backend.utils.skill_gap import compute_skill_gaps, extract_jd_skills
+
+
+# ==============================
+# extract_jd_skills
+# ==============================
+def test_extracts_capitalized_skill_phrases():
+    jd = "Looking for expertise in Machine Learning, cloud tools like AWS and Docker."
+    assert extract_jd_skills(jd) == ["Machine Learning", "AWS", "Docker"]
+
+
+def test_skips_filler_words():
+    jd = (
+        "Technical Skills: Python. Familiarity with Kubernetes. "
+        "Expert in SQL. Proven Experience with Spark."
+    )
+    skills = extract_jd_skills(jd)
+    assert skills == ["Python", "Kubernetes", "SQL", "Spark"]
+    assert "Technical Skills" not in skills
+
+
+def test_trims_trailing_filler_words():
+    assert extract_jd_skills("Strong Python Skills required.") == ["Python"]
+
+
+def test_drops_target_role():
+    jd = "We are hiring a Data Scientist. Must know Python and data scientist tooling like Pandas."
+    skills = extract_jd_skills(jd, "data scientist")
+    assert "Data Scientist" not in skills
+    assert skills == ["Python", "Pandas"]
+
+
+def test_deduplicates_and_handles_empty_text():
+    assert extract_jd_skills("Python, SQL, Python") == ["Python", "SQL"]
+    assert extract_jd_skills("") == []
+    assert extract_jd_skills(None) == []
+
+
+# ==============================
+# compute_skill_gaps
+# ==============================
+def test_skill_gaps_flag_uncovered_skills():
+    result = asyncio.run(
+        compute_skill_gaps(["Python", "SQL"], ["Python", "SQL", "Kubernetes"], threshold=0.6)
+    )
+    assert result["missing"] == ["Kubernetes"]
+    assert result["coverage"]["Python"] == 1.0
+    assert result["coverage"]["Kubernetes"] < 0.6
+    assert set(result["coverage"]) == {"Python", "SQL", "Kubernetes"}
+
+
+def test_skill_gaps_without_jd_skills():
+    assert asyncio.run(compute_skill_gaps(["Python"], [])) == {"missing": [], "coverage": {}}
+
+
+def test_skill_gaps_without_resume_skills():
+    result = asyncio.run(compute_skill_gaps(["", "  "], ["Python", "SQL"]))
+    assert result == {"missing": ["Python", "SQL"], "coverage": {"Python": 0.0, "SQL": 0.0}}
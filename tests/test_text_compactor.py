@@ -0,0 +1,64 @@
+from benchmarks.fakes import FIXTURE_RESUME_PAGES
+from backend.utils.text_compactor import (
+    _trim_to_budget,
+    compact_resume_text,
+    estimate_tokens,
+    normalize_whitespace,
+    split_sections,
+    strip_repeated_headers,
+)
+
+
+def _section_lines(name: str) -> list[str]:
+    pages = strip_repeated_headers([normalize_whitespace(p) for p in FIXTURE_RESUME_PAGES])
+    lines = [line for page in pages for line in page]
+    return [line for section, body in split_sections(lines) if section == name for line in body]
+
+
+# ==============================
+# HEADERS, FOOTERS, PAGE NUMBERS
+# ==============================
+def test_drops_page_numbers_and_repeated_headers():
+    text = compact_resume_text(FIXTURE_RESUME_PAGES)
+    assert "Page 1 of 2" not in text
+    assert "Page 2 of 2" not in text
+    assert text.count("jane.doe@example.com") == 1
+
+
+def test_keeps_numeric_lines_inside_a_page():
+    page = "Jane Doe\nEXPERIENCE\nAcme — Analyst\nSince\n2019\nTeam size\n3\nBuilt dashboards\nRan weekly reviews\nPage 1"
+    lines = strip_repeated_headers([normalize_whitespace(page)])[0]
+    assert "2019" in lines
+    assert "3" in lines
+    assert "Page 1" not in lines
+
+
+# ==============================
+# TOKEN BUDGET
+# ==============================
+def test_fixture_resume_keeps_skills_and_experience():
+    skills, experience = _section_lines("skills"), _section_lines("experience")
+    budget = estimate_tokens("\n".join(skills + experience)) + 20
+
+    text = compact_resume_text(FIXTURE_RESUME_PAGES, token_budget=budget)
+    kept = text.splitlines()
+    assert estimate_tokens(text) <= budget
+    for line in skills + experience:
+        assert kept.count(line) == (skills + experience).count(line)
+    assert "Chess, hiking" not in kept
+
+
+def test_smaller_sections_still_fit_after_an_overflow():
+    sections = [
+        ("skills", ["SKILLS", "Python, SQL"]),
+        ("projects", ["PROJECTS", "x" * 400, "y" * 400]),
+        ("summary", ["SUMMARY", "Short summary."]),
+    ]
+    trimmed = _trim_to_budget(sections, budget=20)
+    assert [name for name, _ in trimmed] == ["skills", "summary"]
+
+
+def test_overflowing_section_is_cut_at_a_line_boundary():
+    sections = [("experience", ["EXPERIENCE", "a" * 40, "b" * 40, "c" * 400])]
+    trimmed = _trim_to_budget(sections, budget=30)
+    assert trimmed == [("experience", ["EXPERIENCE", "a" * 40, "b" * 40])]